@@ -2,25 +2,25 @@
 """
 Debug script to test the exact data format used in comprehensive clean
 """
-import sys
-import os
-sys.path.append(os.path.dirname(__file__))
 
 from scAgent.db.connect import get_connection
 from scAgent.db.query import execute_query
 from scAgent.utils import (
     apply_intelligent_sc_eqtl_filters,
-    build_geo_sra_mapping,
-    create_integrated_dataset_table,
+    integrate_geo_sra,
+    truncate_text,
     assess_database_id_with_confidence,
     assess_species_with_confidence,
     assess_cell_line_with_confidence
 )
+from scAgent.utils_batch import assess_records_parallel, critical_filter_mask
 from rich.console import Console
 from rich.table import Table
 import json
+import logging
 
 console = Console()
+logger = logging.getLogger(__name__)
 
 def debug_comprehensive_clean():
     """Debug the exact process used in comprehensive clean"""
@@ -109,44 +109,37 @@ def debug_comprehensive_clean():
     geo_records = execute_query(geo_query)
     print(f"✓ Loaded {len(geo_records)} GEO records")
     
-    # Step 3: Build mapping
-    print("\n3. Building GEO-SRA mapping...")
-    mapping = build_geo_sra_mapping(geo_records, sra_records)
+    # Steps 3-4: Build mapping and integrated dataset together
+    print("\n3. Building GEO-SRA mapping and integrated dataset...")
+    integrated_records, mapping = integrate_geo_sra(geo_records, sra_records)
     print(f"✓ Built mapping: {len(mapping.get('geo_to_sra', {}))} GEO-SRA links")
-    
-    # Step 4: Create integrated dataset
-    print("\n4. Creating integrated dataset...")
-    integrated_records = create_integrated_dataset_table(geo_records, sra_records, mapping)
-    print(f"✓ Created {len(integrated_records)} integrated records")
+    print(f"\n4. ✓ Created {len(integrated_records)} integrated records")
     
     # Step 5: Show sample integrated record structure
     if integrated_records:
         print("\n5. Sample integrated record structure:")
         sample_record = integrated_records[0]
-        print("Available fields:")
+        lines = ["Available fields:"]
         for key, value in sample_record.items():
-            value_str = str(value)[:50] + "..." if len(str(value)) > 50 else str(value)
-            print(f"  {key}: {value_str}")
+            lines.append(f"  {key}: {truncate_text(str(value), placeholder='')}")
+        print("\n".join(lines))
     
     # Step 6: Test individual assessment functions on integrated records
     print("\n6. Testing assessment functions on integrated records...")
     
-    for i, record in enumerate(integrated_records[:3], 1):
+    # Score all records in vectorized chunks (spread over processes for large batches)
+    critical_batch = assess_records_parallel(integrated_records, ["Homo sapiens", "human"])
+    
+    for i, (record, scores) in enumerate(zip(integrated_records[:3], critical_batch.itertuples()), 1):
         print(f"\n--- Integrated Record {i} ---")
         print(f"SRA Run: {record.get('sra_run_accession', 'N/A')}")
         print(f"GEO: {record.get('geo_accession', 'N/A')}")
-        
-        # Test database ID assessment
-        db_result = assess_database_id_with_confidence(record)
-        print(f"DB Assessment: {db_result}")
-        
-        # Test species assessment
-        species_result = assess_species_with_confidence(record, ["Homo sapiens", "human"])
-        print(f"Species Assessment: {species_result}")
-        
-        # Test cell line assessment
-        cell_result = assess_cell_line_with_confidence(record)
-        print(f"Cell Line Assessment: {cell_result}")
+        print(f"DB Assessment: score={scores.database_id_score}, confidence={scores.database_id_confidence}")
+        print(f"Species Assessment: score={scores.species_score}, confidence={scores.species_confidence}")
+        print(f"Cell Line Assessment: score={scores.cell_line_score}, confidence={scores.cell_line_confidence}")
+    
+    critical_passed = critical_filter_mask(critical_batch)
+    print(f"\n✓ Phase 1 critical filters: {int(critical_passed.sum())}/{len(critical_batch)} records pass")
     
     # Step 7: Test intelligent filtering
     print("\n7. Testing intelligent filtering...")
@@ -196,37 +189,33 @@ def debug_comprehensive_clean():
                 test_record = integrated_records[0]
                 print(f"\nAnalyzing first record: {test_record.get('sra_run_accession', 'N/A')}")
                 
-                # Manual phase 1 check
-                db_result = assess_database_id_with_confidence(test_record)
-                species_result = assess_species_with_confidence(test_record, ["Homo sapiens", "human"])
-                cell_result = assess_cell_line_with_confidence(test_record)
-                
-                print(f"  Database ID: score={db_result['score']}, confidence={db_result['confidence']}")
-                print(f"  Species: score={species_result['score']}, confidence={species_result['confidence']}")
-                print(f"  Cell Line: score={cell_result['score']}, confidence={cell_result['confidence']}")
-                
-                # Check phase 1 logic
-                passes_critical = True
+                # Manual phase 1 check, stopping at the first rejecting criterion
                 rejection_reason = None
                 
+                db_result = assess_database_id_with_confidence(test_record)
+                print(f"  Database ID: score={db_result['score']}, confidence={db_result['confidence']}")
                 if db_result['score'] == 0:
-                    passes_critical = False
                     rejection_reason = f"No valid database ID: {db_result['reason']}"
-                elif species_result['score'] == 0 and species_result['confidence'] >= 0.7:
-                    passes_critical = False
-                    rejection_reason = f"Non-human species (high confidence): {species_result['reason']}"
-                elif cell_result['score'] == 0 and cell_result['confidence'] >= 0.8:
-                    passes_critical = False
-                    rejection_reason = f"Cell line detected (high confidence): {cell_result['reason']}"
                 
+                if rejection_reason is None:
+                    species_result = assess_species_with_confidence(test_record, ["Homo sapiens", "human"])
+                    print(f"  Species: score={species_result['score']}, confidence={species_result['confidence']}")
+                    if species_result['score'] == 0 and species_result['confidence'] >= 0.7:
+                        rejection_reason = f"Non-human species (high confidence): {species_result['reason']}"
+                
+                if rejection_reason is None:
+                    cell_result = assess_cell_line_with_confidence(test_record)
+                    print(f"  Cell Line: score={cell_result['score']}, confidence={cell_result['confidence']}")
+                    if cell_result['score'] == 0 and cell_result['confidence'] >= 0.8:
+                        rejection_reason = f"Cell line detected (high confidence): {cell_result['reason']}"
+                
+                passes_critical = rejection_reason is None
                 print(f"  Phase 1 Result: {'PASS' if passes_critical else 'FAIL'}")
                 if rejection_reason:
                     print(f"  Rejection Reason: {rejection_reason}")
                 
     except Exception as e:
-        print(f"❌ Error in intelligent filtering: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("❌ Error in intelligent filtering: %s", e)
 
 if __name__ == "__main__":
     debug_comprehensive_clean() 
\ No newline at end of file
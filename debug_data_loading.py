@@ -3,13 +3,12 @@
 Debug script to check actual data loading in comprehensive clean command.
 """
 
-import sys
-import os
-sys.path.append('.')
-sys.path.append('scAgent')
+import logging
 
 from scAgent.db.query import execute_query
-from scAgent.utils import check_database_id_availability, check_species_filter_lenient
+from scAgent.utils import check_database_id_availability, check_species_filter_lenient, truncate_text
+
+logger = logging.getLogger(__name__)
 
 def main():
     print("=== Debugging Data Loading in Comprehensive Clean ===")
@@ -76,7 +75,7 @@ def main():
             species_result = check_species_filter_lenient(test_record, ["Homo sapiens", "human"])
             print(f"Species check result: {species_result}")
             print(f"  scientific_name: {test_record.get('scientific_name')}")
-            print(f"  study_title: {test_record.get('study_title', '')[:100]}...")
+            print(f"  study_title: {truncate_text(test_record.get('study_title'), 100)}")
             
     except Exception as e:
         print(f"SRA query failed: {e}")
@@ -133,7 +132,7 @@ def main():
             species_result = check_species_filter_lenient(test_record, ["Homo sapiens", "human"])
             print(f"Species check result: {species_result}")
             print(f"  organism: {test_record.get('organism')}")
-            print(f"  gse_title: {test_record.get('gse_title', '')[:100]}...")
+            print(f"  gse_title: {truncate_text(test_record.get('gse_title'), 100)}")
             
     except Exception as e:
         print(f"GEO query failed: {e}")
@@ -180,10 +179,13 @@ def main():
             filter_scores = filter_result.get("filter_scores", {})
             passes = filter_result.get("passes_required_filters", False)
             reasons = filter_result.get("filter_reasons", [])
+            gse, run_accession, organism, scientific_name = (
+                record.get(field) for field in ('gse', 'run_accession', 'organism', 'scientific_name')
+            )
             
             print(f"\nRecord {i+1} ({record.get('data_source')}):")
-            print(f"  ID: {record.get('gse') or record.get('run_accession')}")
-            print(f"  Species field: {record.get('organism') or record.get('scientific_name')}")
+            print(f"  ID: {gse or run_accession}")
+            print(f"  Species field: {organism or scientific_name}")
             print(f"  Scores: {filter_scores}")
             print(f"  Passes: {passes}")
             print(f"  Reasons: {reasons}")
@@ -191,20 +193,18 @@ def main():
             # Debug specific failing filters
             if filter_scores.get('database_id', 0) == 0:
                 print(f"  DEBUG - DB ID issue:")
-                print(f"    gse: {record.get('gse')}")
-                print(f"    run_accession: {record.get('run_accession')}")
+                print(f"    gse: {gse}")
+                print(f"    run_accession: {run_accession}")
                 
             if filter_scores.get('species', 0) == 0:
                 print(f"  DEBUG - Species issue:")
-                print(f"    organism: {record.get('organism')}")
-                print(f"    scientific_name: {record.get('scientific_name')}")
-                print(f"    gse_title: {record.get('gse_title', '')[:50]}...")
-                print(f"    study_title: {record.get('study_title', '')[:50]}...")
+                print(f"    organism: {organism}")
+                print(f"    scientific_name: {scientific_name}")
+                print(f"    gse_title: {truncate_text(record.get('gse_title'))}")
+                print(f"    study_title: {truncate_text(record.get('study_title'))}")
         
     except Exception as e:
-        print(f"Combined processing failed: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Combined processing failed: %s", e)
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -3,13 +3,12 @@
 Debug script to understand why database ID filtering is failing.
 """
 
-import sys
-import os
-sys.path.append('.')
-sys.path.append('scAgent')
-
 from scAgent.db.connect import get_connection
-from scAgent.utils import check_database_id_availability, safe_int_convert
+from scAgent.utils import check_database_id_availability, safe_int_convert, truncate_text
+
+# Column order of the sample queries below
+GEO_COLUMNS = ('gse', 'gse_title', 'organism')
+SRA_COLUMNS = ('run_accession', 'study_title', 'scientific_name')
 
 def main():
     print("=== Debugging Database ID Filtering ===")
@@ -29,14 +28,10 @@ def main():
     
     geo_records = []
     for row in cur.fetchall():
-        record = {
-            'gse': row[0],
-            'gse_title': row[1],
-            'organism': row[2],
-            'data_source': 'GEO'
-        }
+        record = dict(zip(GEO_COLUMNS, row))
+        record['data_source'] = 'GEO'
         geo_records.append(record)
-        print(f'gse: {row[0]}, title: {row[1][:50] if row[1] else "None"}..., organism: {row[2]}')
+        print(f'gse: {row[0]}, title: {truncate_text(row[1])}, organism: {row[2]}')
     
     print('\n=== Sample SRA records ===')
     cur.execute('''
@@ -48,14 +43,10 @@ def main():
     
     sra_records = []
     for row in cur.fetchall():
-        record = {
-            'run_accession': row[0],
-            'study_title': row[1],
-            'scientific_name': row[2],
-            'data_source': 'SRA'
-        }
+        record = dict(zip(SRA_COLUMNS, row))
+        record['data_source'] = 'SRA'
         sra_records.append(record)
-        print(f'run_accession: {row[0]}, title: {row[1][:50] if row[1] else "None"}..., organism: {row[2]}')
+        print(f'run_accession: {row[0]}, title: {truncate_text(row[1])}, organism: {row[2]}')
     
     # Test our database ID check function
     print('\n=== Testing Database ID Function ===')
@@ -3,52 +3,104 @@
 Debug script to check human data availability in the database.
 """
 
-import sys
-import os
-sys.path.append('.')
-sys.path.append('scAgent')
+import re
+from concurrent.futures import ThreadPoolExecutor
 
-from scAgent.db.query import execute_query
+from scAgent.db.connect import pooled_connection
+from scAgent.db.query import execute_query, execute_query_stream
+from scAgent.utils import truncate_text
+
+BASIC_HUMAN_INDICATORS = ('homo sapiens', 'human', 'patient', 'clinical')
+
+HUMAN_INDICATORS = (
+    'homo sapiens', 'human', 'h. sapiens', 'hsapiens',
+    'people', 'patient', 'subject', 'clinical', 'medical',
+    'cancer', 'tumor', 'disease', 'breast', 'lung', 'liver',
+    'brain', 'blood', 'pbmc', 'peripheral blood'
+)
+
+# One alternation per indicator set; the pattern text is also valid for
+# PostgreSQL's case-insensitive ~* operator.
+BASIC_HUMAN_RE = re.compile('|'.join(map(re.escape, BASIC_HUMAN_INDICATORS)), re.IGNORECASE)
+HUMAN_RE = re.compile('|'.join(map(re.escape, HUMAN_INDICATORS)), re.IGNORECASE)
+
+# Each aggregate evaluates all of its probes in a single table scan
+SRA_COUNTS_QUERY = """
+SELECT
+    COUNT(*) AS total,
+    COUNT(*) FILTER (
+        WHERE LOWER(scientific_name) LIKE '%homo sapiens%'
+        OR LOWER(scientific_name) LIKE '%human%'
+    ) AS by_name,
+    COUNT(*) FILTER (
+        WHERE LOWER(study_title) LIKE '%homo sapiens%'
+        OR LOWER(study_title) LIKE '%human%'
+        OR LOWER(study_title) LIKE '%patient%'
+        OR LOWER(study_title) LIKE '%clinical%'
+    ) AS by_title,
+    COUNT(*) FILTER (
+        WHERE LOWER(design_description) LIKE '%homo sapiens%'
+        OR LOWER(design_description) LIKE '%human%'
+    ) AS by_design
+FROM srameta.sra_master
+"""
+
+GEO_COUNTS_QUERY = """
+SELECT
+    COUNT(*) AS total,
+    COUNT(*) FILTER (
+        WHERE LOWER(organism) LIKE '%homo sapiens%'
+        OR LOWER(organism) LIKE '%human%'
+    ) AS by_organism,
+    COUNT(*) FILTER (
+        WHERE LOWER(gse_title) LIKE '%homo sapiens%'
+        OR LOWER(gse_title) LIKE '%human%'
+        OR LOWER(gse_title) LIKE '%patient%'
+        OR LOWER(gse_title) LIKE '%clinical%'
+    ) AS by_title
+FROM geometa.geo_master
+"""
+
+# Matched server-side so only the counts come back over the wire
+SAMPLE_COUNTS_QUERY = """
+SELECT
+    COUNT(*) AS sampled,
+    COUNT(*) FILTER (WHERE haystack ~* %(basic)s) AS human_count,
+    COUNT(*) FILTER (WHERE haystack ~* %(enhanced)s) AS enhanced_human_count
+FROM (
+    SELECT CONCAT_WS(' ', study_title, scientific_name, design_description) AS haystack
+    FROM srameta.sra_master TABLESAMPLE SYSTEM (0.1)
+    LIMIT 1000
+) AS sampled_records
+"""
+
+def pooled_query(query, params=None):
+    """Run a query on a connection borrowed from the shared pool."""
+    with pooled_connection() as conn:
+        return execute_query(query, params, conn)
 
 def main():
     print("=== Checking Human Data Availability ===")
     
+    # The aggregates are independent server-side scans, so run them concurrently,
+    # each on its own pooled connection
+    executor = ThreadPoolExecutor(max_workers=3)
+    sra_counts_future = executor.submit(pooled_query, SRA_COUNTS_QUERY)
+    geo_counts_future = executor.submit(pooled_query, GEO_COUNTS_QUERY)
+    sample_counts_future = executor.submit(pooled_query, SAMPLE_COUNTS_QUERY, {
+        'basic': BASIC_HUMAN_RE.pattern,
+        'enhanced': HUMAN_RE.pattern,
+    })
+    executor.shutdown(wait=False)
+    
     # Check SRA data for human records
     print("\n=== SRA Human Data Check ===")
     
-    # Check total SRA records
-    sra_total_query = "SELECT COUNT(*) FROM srameta.sra_master"
-    sra_total = execute_query(sra_total_query)
-    print(f"Total SRA records: {sra_total[0][0]:,}")
-    
-    # Check human records by scientific_name
-    sra_human_by_name_query = """
-    SELECT COUNT(*) FROM srameta.sra_master 
-    WHERE LOWER(scientific_name) LIKE '%homo sapiens%' 
-    OR LOWER(scientific_name) LIKE '%human%'
-    """
-    sra_human_by_name = execute_query(sra_human_by_name_query)
-    print(f"SRA human records (by scientific_name): {sra_human_by_name[0][0]:,}")
-    
-    # Check human records by study_title
-    sra_human_by_title_query = """
-    SELECT COUNT(*) FROM srameta.sra_master 
-    WHERE LOWER(study_title) LIKE '%homo sapiens%' 
-    OR LOWER(study_title) LIKE '%human%'
-    OR LOWER(study_title) LIKE '%patient%'
-    OR LOWER(study_title) LIKE '%clinical%'
-    """
-    sra_human_by_title = execute_query(sra_human_by_title_query)
-    print(f"SRA human records (by study_title): {sra_human_by_title[0][0]:,}")
-    
-    # Check human records by design_description
-    sra_human_by_design_query = """
-    SELECT COUNT(*) FROM srameta.sra_master 
-    WHERE LOWER(design_description) LIKE '%homo sapiens%' 
-    OR LOWER(design_description) LIKE '%human%'
-    """
-    sra_human_by_design = execute_query(sra_human_by_design_query)
-    print(f"SRA human records (by design_description): {sra_human_by_design[0][0]:,}")
+    sra_counts = sra_counts_future.result()[0]
+    print(f"Total SRA records: {sra_counts['total']:,}")
+    print(f"SRA human records (by scientific_name): {sra_counts['by_name']:,}")
+    print(f"SRA human records (by study_title): {sra_counts['by_title']:,}")
+    print(f"SRA human records (by design_description): {sra_counts['by_design']:,}")
     
     # Get some sample human SRA records
     sra_human_sample_query = """
@@ -62,38 +114,18 @@ def main():
     OR LOWER(design_description) LIKE '%human%'
     LIMIT 10
     """
-    sra_human_samples = execute_query(sra_human_sample_query)
     print(f"\nSample human SRA records:")
-    for record in sra_human_samples:
-        print(f"  {record[0]}: {record[1][:50]}... | {record[2]} | {record[3][:50] if record[3] else 'None'}...")
+    with pooled_connection() as conn:
+        for record in execute_query_stream(sra_human_sample_query, conn=conn):
+            print(f"  {record['run_accession']}: {truncate_text(record['study_title'])} | {record['scientific_name']} | {truncate_text(record['design_description'])}")
     
     # Check GEO data for human records
     print("\n=== GEO Human Data Check ===")
     
-    # Check total GEO records
-    geo_total_query = "SELECT COUNT(*) FROM geometa.geo_master"
-    geo_total = execute_query(geo_total_query)
-    print(f"Total GEO records: {geo_total[0][0]:,}")
-    
-    # Check human records by organism
-    geo_human_by_organism_query = """
-    SELECT COUNT(*) FROM geometa.geo_master 
-    WHERE LOWER(organism) LIKE '%homo sapiens%' 
-    OR LOWER(organism) LIKE '%human%'
-    """
-    geo_human_by_organism = execute_query(geo_human_by_organism_query)
-    print(f"GEO human records (by organism): {geo_human_by_organism[0][0]:,}")
-    
-    # Check human records by title
-    geo_human_by_title_query = """
-    SELECT COUNT(*) FROM geometa.geo_master 
-    WHERE LOWER(gse_title) LIKE '%homo sapiens%' 
-    OR LOWER(gse_title) LIKE '%human%'
-    OR LOWER(gse_title) LIKE '%patient%'
-    OR LOWER(gse_title) LIKE '%clinical%'
-    """
-    geo_human_by_title = execute_query(geo_human_by_title_query)
-    print(f"GEO human records (by gse_title): {geo_human_by_title[0][0]:,}")
+    geo_counts = geo_counts_future.result()[0]
+    print(f"Total GEO records: {geo_counts['total']:,}")
+    print(f"GEO human records (by organism): {geo_counts['by_organism']:,}")
+    print(f"GEO human records (by gse_title): {geo_counts['by_title']:,}")
     
     # Get some sample human GEO records
     geo_human_sample_query = """
@@ -107,51 +139,25 @@ def main():
     OR LOWER(organism_ch1) LIKE '%human%'
     LIMIT 10
     """
-    geo_human_samples = execute_query(geo_human_sample_query)
     print(f"\nSample human GEO records:")
-    for record in geo_human_samples:
-        print(f"  {record[0]}: {record[1][:50]}... | {record[2]} | {record[3]}")
-    
-    # Now let's test what happens with the first 1000 SRA records (as used in comprehensive clean)
-    print("\n=== Testing First 1000 SRA Records ===")
-    test_query = """
-    SELECT run_accession, study_title, scientific_name, design_description
-    FROM srameta.sra_master 
-    LIMIT 1000
-    """
-    test_records = execute_query(test_query)
+    with pooled_connection() as conn:
+        for record in execute_query_stream(geo_human_sample_query, conn=conn):
+            print(f"  {record['gse']}: {truncate_text(record['gse_title'])} | {record['organism']} | {record['organism_ch1']}")
     
-    human_count = 0
-    for record in test_records:
-        text_to_check = f"{record[1] or ''} {record[2] or ''} {record[3] or ''}".lower()
-        if ('homo sapiens' in text_to_check or 'human' in text_to_check or 
-            'patient' in text_to_check or 'clinical' in text_to_check):
-            human_count += 1
+    # Now let's test what happens with a block sample of up to 1000 SRA records
+    print("\n=== Testing Sampled SRA Records ===")
+    test_counts = sample_counts_future.result()[0]
+    sampled = test_counts['sampled']
+    human_count = test_counts['human_count']
+    enhanced_human_count = test_counts['enhanced_human_count']
     
-    print(f"Human records in first 1000 SRA records: {human_count}")
-    print(f"Percentage: {human_count/1000*100:.1f}%")
+    print(f"Human records in {sampled} sampled SRA records: {human_count}")
+    print(f"Percentage: {human_count/max(sampled, 1)*100:.1f}%")
     
     # Test with better human detection
     print("\n=== Enhanced Human Detection Test ===")
-    enhanced_human_count = 0
-    for record in test_records:
-        text_to_check = f"{record[1] or ''} {record[2] or ''} {record[3] or ''}".lower()
-        
-        # More comprehensive human detection
-        human_indicators = [
-            'homo sapiens', 'human', 'h. sapiens', 'hsapiens', 
-            'people', 'patient', 'subject', 'clinical', 'medical',
-            'cancer', 'tumor', 'disease', 'breast', 'lung', 'liver',
-            'brain', 'blood', 'pbmc', 'peripheral blood'
-        ]
-        
-        for indicator in human_indicators:
-            if indicator in text_to_check:
-                enhanced_human_count += 1
-                break
-    
-    print(f"Enhanced human detection in first 1000 SRA records: {enhanced_human_count}")
-    print(f"Enhanced percentage: {enhanced_human_count/1000*100:.1f}%")
+    print(f"Enhanced human detection in {sampled} sampled SRA records: {enhanced_human_count}")
+    print(f"Enhanced percentage: {enhanced_human_count/max(sampled, 1)*100:.1f}%")
     
     if enhanced_human_count > human_count:
         print(f"Enhanced detection found {enhanced_human_count - human_count} additional potential human records")
@@ -3,107 +3,95 @@
 Debug script for the new intelligent filtering system.
 """
 
-import sys
-import os
-sys.path.append('.')
-sys.path.append('scAgent')
+import argparse
 
 from scAgent.db.query import execute_query
 from scAgent.utils import (
+    truncate_text,
     apply_intelligent_sc_eqtl_filters,
     assess_database_id_with_confidence,
-    assess_species_with_confidence,
     assess_cell_line_with_confidence
 )
+from scAgent.utils_batch import assess_species_batch
 
-def main():
+# SRA columns read by the assess_*_with_confidence functions (and printed below)
+SRA_ASSESSED_COLUMNS = (
+    "run_accession",
+    "study_title",
+    "study_abstract",
+    "scientific_name",
+    "common_name",
+    "taxon_id",
+    "platform",
+    "library_strategy",
+    "spots",
+    "design_description",
+    "sample_name",
+    "study_accession",
+)
+
+# Every column the script used to load, for inspecting raw records (--full)
+SRA_FULL_COLUMNS = (
+    "run_accession",
+    "study_title",
+    "study_abstract",
+    "scientific_name",
+    "platform",
+    "instrument_model",
+    "library_strategy",
+    "library_source",
+    "library_selection",
+    "library_layout",
+    "spots",
+    "bases",
+    "run_date",
+    "updated_date",
+    "study_type",
+    "study_description",
+    "design_description",
+    "library_construction_protocol",
+    "sample_name",
+    "description as sample_description",
+    "taxon_id",
+    "common_name",
+    "study_accession",
+    "experiment_accession",
+    "sample_accession",
+)
+
+def main(full=False):
     print("=== Debugging Intelligent Filtering System ===")
     
     # Load some test records
-    sra_query = """
+    columns = SRA_FULL_COLUMNS if full else SRA_ASSESSED_COLUMNS
+    sra_query = f"""
     SELECT 
-        run_accession,
-        study_title,
-        study_abstract,
-        scientific_name,
-        platform,
-        instrument_model,
-        library_strategy,
-        library_source,
-        library_selection,
-        library_layout,
-        spots,
-        bases,
-        run_date,
-        updated_date,
-        study_type,
-        study_description,
-        design_description,
-        library_construction_protocol,
-        sample_name,
-        description as sample_description,
-        taxon_id,
-        common_name,
-        study_accession,
-        experiment_accession,
-        sample_accession,
-        'SRA' as data_source
-    FROM srameta.sra_master
-    ORDER BY human_priority DESC, "sra_ID" DESC
-    LIMIT 10
-    """
-    
-    # Remove the ORDER BY clause that doesn't work
-    sra_query_fixed = """
-    SELECT 
-        run_accession,
-        study_title,
-        study_abstract,
-        scientific_name,
-        platform,
-        instrument_model,
-        library_strategy,
-        library_source,
-        library_selection,
-        library_layout,
-        spots,
-        bases,
-        run_date,
-        updated_date,
-        study_type,
-        study_description,
-        design_description,
-        library_construction_protocol,
-        sample_name,
-        description as sample_description,
-        taxon_id,
-        common_name,
-        study_accession,
-        experiment_accession,
-        sample_accession,
+        {", ".join(columns)},
         'SRA' as data_source
     FROM srameta.sra_master
     LIMIT 10
     """
     
     try:
-        records = execute_query(sra_query_fixed)
+        records = execute_query(sra_query)
         print(f"Loaded {len(records)} test records")
         
         # Test individual assessment functions
         print("\n=== Testing Individual Assessment Functions ===")
         
+        species_batch = assess_species_batch(records, ["Homo sapiens", "human"])
+        
         for i, record in enumerate(records[:3]):
             print(f"\nRecord {i+1}: {record.get('run_accession')}")
-            print(f"Title: {record.get('study_title', '')[:100]}...")
+            print(f"Title: {truncate_text(record.get('study_title'), 100)}")
             
             # Test database ID assessment
             db_result = assess_database_id_with_confidence(record)
             print(f"Database ID: {db_result}")
             
-            # Test species assessment
-            species_result = assess_species_with_confidence(record, ["Homo sapiens", "human"])
-            print(f"Species: {species_result}")
+            # Species scores come from the batch pass above
+            species_scores = species_batch.iloc[i]
+            print(f"Species: score={species_scores['species_score']}, confidence={species_scores['species_confidence']}")
             
             # Test cell line assessment
             cell_line_result = assess_cell_line_with_confidence(record)
@@ -157,4 +145,7 @@ def main():
         traceback.print_exc()
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--full', action='store_true',
+                        help='Load every SRA column instead of only those the assessors read')
+    main(full=parser.parse_args().full) 
\ No newline at end of file
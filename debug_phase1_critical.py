@@ -2,23 +2,33 @@
 """
 Debug script to analyze why Phase 1 critical filters reject all records
 """
+import argparse
+import io
 import sys
-import os
-sys.path.append(os.path.dirname(__file__))
 
-from scAgent.db.connect import get_connection
+from scAgent.db.connect import pooled_connection
+from scAgent.db.query import execute_query_frame, SRA_HUMAN_CANDIDATE_SQL
 from scAgent.utils import (
+    truncate_text,
     assess_database_id_with_confidence,
     assess_species_with_confidence, 
     assess_cell_line_with_confidence
 )
+from scAgent.utils_batch import (
+    assess_records_parallel,
+    critical_filter_reasons,
+    CRITICAL_PASS,
+    CRITICAL_NO_DATABASE_ID,
+    CRITICAL_NON_HUMAN,
+    CRITICAL_CELL_LINE
+)
 from rich.console import Console
 from rich.table import Table
 from rich import print as rprint
+from collections import Counter
 import logging
 
-# Setup logging
-logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
 console = Console()
 
 def debug_phase1_critical():
@@ -26,152 +36,138 @@ def debug_phase1_critical():
     
     print("=== Debugging Phase 1 Critical Filters ===")
     
-    # Load sample data
-    conn = get_connection()
-    cursor = conn.cursor()
+    # Load sample data; NULL handling is done in SQL so rows arrive ready to use
+    # Obvious non-human rows are dropped by the index-backed WHERE clause
+    with pooled_connection() as conn:
+        records = execute_query_frame(f"""
+            SELECT "sra_ID",
+                   COALESCE("run_accession", '') AS run_accession,
+                   COALESCE("study_title", '') AS study_title,
+                   COALESCE("study_abstract", '') AS study_abstract,
+                   COALESCE("scientific_name", '') AS scientific_name,
+                   "spots", "bases"
+            FROM srameta.sra_master 
+            WHERE "run_accession" IS NOT NULL AND "run_accession" != ''
+              AND {SRA_HUMAN_CANDIDATE_SQL}
+            ORDER BY "sra_ID" DESC
+            LIMIT 20
+        """)
     
-    # Get 20 sample records to debug
-    cursor.execute("""
-        SELECT "sra_ID", "run_accession", "study_title", "study_abstract", "scientific_name", 
-               "spots", "bases"
-        FROM srameta.sra_master 
-        WHERE "run_accession" IS NOT NULL AND "run_accession" != ''
-        ORDER BY "sra_ID" DESC
-        LIMIT 20
-    """)
+    logger.info(f"Loaded {len(records)} sample records for analysis")
     
-    records = []
-    for row in cursor.fetchall():
-        record = {
-            'sra_ID': row[0],
-            'run_accession': row[1] or '',
-            'study_title': row[2] or '',
-            'study_abstract': row[3] or '',
-            'scientific_name': row[4] or '',
-            'spots': row[5],
-            'bases': row[6]
-        }
-        records.append(record)
+    # Score and decide phase 1 for the whole sample in vectorized chunks
+    critical_batch = assess_records_parallel(records, ["Homo sapiens"])
+    reason_codes = critical_filter_reasons(critical_batch)
     
-    cursor.close()
-    conn.close()
+    # Results are tallied and added to the table as each record is processed
+    table = Table(title="Phase 1 Critical Filter Results")
+    table.add_column("Record ID", style="cyan")
+    table.add_column("DB Score", style="green")
+    table.add_column("Species Score", style="blue") 
+    table.add_column("Cell Score", style="yellow")
+    table.add_column("Result", style="red")
     
-    print(f"Loaded {len(records)} sample records for analysis")
-    print()
+    tested = 0
+    passed = 0
+    failure_reasons = Counter()
     
     # Test each record through phase 1 critical filters
-    critical_results = []
-    
-    for i, record in enumerate(records[:10], 1):
-        print(f"=== Record {i}: {record['sra_ID']} ===")
-        print(f"Run Accession: {record['run_accession']}")
-        print(f"Title: {record['study_title'][:100]}...")
-        print(f"Scientific Name: {record['scientific_name']}")
-        print(f"Spots: {record['spots']}")
-        print()
-        
-        # Test database ID confidence
-        db_result = assess_database_id_with_confidence(record)
-        print(f"Database ID Assessment:")
-        print(f"  Score: {db_result['score']}")
-        print(f"  Confidence: {db_result['confidence']}")
-        print(f"  Reason: {db_result['reason']}")
-        print()
-        
-        # Test species confidence  
-        species_result = assess_species_with_confidence(record, ["Homo sapiens"])
-        print(f"Species Assessment:")
-        print(f"  Score: {species_result['score']}")
-        print(f"  Confidence: {species_result['confidence']}")
-        print(f"  Reason: {species_result['reason']}")
-        print()
+    # Per-record details are only formatted when debug logging is on (-vv)
+    show_records = logger.isEnabledFor(logging.DEBUG)
+    for i, (scores, reason_code) in enumerate(
+        zip(critical_batch.head(10).itertuples(), reason_codes), 1
+    ):
+        # Only the rows needed are turned back into record dicts
+        record = None
+        if show_records or reason_code != CRITICAL_PASS:
+            record = records.iloc[i - 1].to_dict()
         
-        # Test cell line confidence
-        cell_result = assess_cell_line_with_confidence(record)
-        print(f"Cell Line Assessment:")
-        print(f"  Score: {cell_result['score']}")
-        print(f"  Confidence: {cell_result['confidence']}")
-        print(f"  Reason: {cell_result['reason']}")
-        print()
-        
-        # Check critical filter logic
-        passes_critical = True
+        # Only failures need the scalar assessor, to explain the rejection
+        passes_critical = reason_code == CRITICAL_PASS
         rejection_reason = None
         
         # Critical filter 1: Database ID must be valid
-        if db_result['score'] == 0:
-            passes_critical = False
+        if reason_code == CRITICAL_NO_DATABASE_ID:
+            db_result = assess_database_id_with_confidence(record)
             rejection_reason = f"No valid database ID: {db_result['reason']}"
         
         # Critical filter 2: Species must be human (if specified)
-        elif species_result['score'] == 0 and species_result['confidence'] >= 0.7:
-            passes_critical = False
+        elif reason_code == CRITICAL_NON_HUMAN:
+            species_result = assess_species_with_confidence(record, ["Homo sapiens"])
             rejection_reason = f"Non-human species (high confidence): {species_result['reason']}"
         
         # Critical filter 3: Cell line exclusion
-        elif cell_result['score'] == 0 and cell_result['confidence'] >= 0.8:
-            passes_critical = False
+        elif reason_code == CRITICAL_CELL_LINE:
+            cell_result = assess_cell_line_with_confidence(record)
             rejection_reason = f"Cell line detected (high confidence): {cell_result['reason']}"
         
-        print(f"PHASE 1 RESULT: {'PASS' if passes_critical else 'FAIL'}")
-        if rejection_reason:
-            print(f"REJECTION REASON: {rejection_reason}")
-        print("-" * 80)
-        print()
+        if show_records:
+            lines = [
+                f"=== Record {i}: {record['sra_ID']} ===",
+                f"Run Accession: {record['run_accession']}",
+                f"Title: {truncate_text(record['study_title'], 100)}",
+                f"Scientific Name: {record['scientific_name']}",
+                f"Spots: {record['spots']}",
+                "",
+                "Database ID Assessment:",
+                f"  Score: {scores.database_id_score}",
+                f"  Confidence: {scores.database_id_confidence}",
+                "",
+                "Species Assessment:",
+                f"  Score: {scores.species_score}",
+                f"  Confidence: {scores.species_confidence}",
+                "",
+                "Cell Line Assessment:",
+                f"  Score: {scores.cell_line_score}",
+                f"  Confidence: {scores.cell_line_confidence}",
+                "",
+                f"PHASE 1 RESULT: {'PASS' if passes_critical else 'FAIL'}",
+            ]
+            if rejection_reason:
+                lines.append(f"REJECTION REASON: {rejection_reason}")
+            lines += ["-" * 80, ""]
+            logger.debug("\n".join(lines))
         
-        critical_results.append({
-            'record_id': record['sra_ID'],
-            'passes_critical': passes_critical,
-            'rejection_reason': rejection_reason,
-            'db_score': db_result['score'],
-            'species_score': species_result['score'],
-            'cell_score': cell_result['score']
-        })
-    
-    # Summary
-    print("=== PHASE 1 CRITICAL FILTER SUMMARY ===")
-    passed = sum(1 for r in critical_results if r['passes_critical'])
-    failed = len(critical_results) - passed
+        tested += 1
+        if passes_critical:
+            passed += 1
+        else:
+            failure_reasons[rejection_reason] += 1
+        
+        table.add_row(
+            str(records.at[i - 1, 'sra_ID']),
+            str(scores.database_id_score),
+            str(scores.species_score),
+            str(scores.cell_line_score),
+            "PASS" if passes_critical else "FAIL"
+        )
     
-    print(f"Total tested: {len(critical_results)}")
-    print(f"Passed: {passed}")
-    print(f"Failed: {failed}")
-    print(f"Pass rate: {(passed/len(critical_results)*100):.1f}%")
-    print()
+    # Summary, written in one go
+    failed = tested - passed
+    summary = io.StringIO()
+    summary.write("=== PHASE 1 CRITICAL FILTER SUMMARY ===\n")
+    summary.write(f"Total tested: {tested}\n")
+    summary.write(f"Passed: {passed}\n")
+    summary.write(f"Failed: {failed}\n")
+    summary.write(f"Pass rate: {(passed/tested*100):.1f}%\n\n")
     
     # Analyze failure reasons
-    failure_reasons = {}
-    for result in critical_results:
-        if not result['passes_critical']:
-            reason = result['rejection_reason']
-            if reason in failure_reasons:
-                failure_reasons[reason] += 1
-            else:
-                failure_reasons[reason] = 1
-    
     if failure_reasons:
-        print("FAILURE REASONS:")
+        summary.write("FAILURE REASONS:\n")
         for reason, count in failure_reasons.items():
-            print(f"  {count}x: {reason}")
+            summary.write(f"  {count}x: {reason}\n")
     
-    # Create summary table
-    table = Table(title="Phase 1 Critical Filter Results")
-    table.add_column("Record ID", style="cyan")
-    table.add_column("DB Score", style="green")
-    table.add_column("Species Score", style="blue") 
-    table.add_column("Cell Score", style="yellow")
-    table.add_column("Result", style="red")
-    
-    for result in critical_results:
-        table.add_row(
-            result['record_id'],
-            str(result['db_score']),
-            str(result['species_score']),
-            str(result['cell_score']),
-            "PASS" if result['passes_critical'] else "FAIL"
-        )
+    sys.stdout.write(summary.getvalue())
+    sys.stdout.flush()
     
     console.print(table)
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('-v', '--verbose', action='count', default=0,
+                        help='-v for progress logging, -vv to print every record')
+    args = parser.parse_args()
+    
+    levels = [logging.WARNING, logging.INFO, logging.DEBUG]
+    logging.basicConfig(level=levels[min(args.verbose, 2)], format="%(message)s")
     debug_phase1_critical() 
\ No newline at end of file
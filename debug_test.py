@@ -3,10 +3,6 @@
 Debug script to test data loading and basic filtering.
 """
 
-import sys
-import os
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'scAgent'))
-
 from scAgent.db.query import execute_query
 from scAgent.utils import safe_int_convert
 
@@ -34,14 +30,17 @@ def test_data_loading():
         # Test data types
         for i, record in enumerate(sra_records[:3]):
             print(f"\nRecord {i+1}:")
-            print(f"  run_accession: {record.get('run_accession')} (type: {type(record.get('run_accession'))})")
-            print(f"  title: {record.get('title')} (type: {type(record.get('title'))})")
-            print(f"  spots: {record.get('spots')} (type: {type(record.get('spots'))})")
-            print(f"  bases: {record.get('bases')} (type: {type(record.get('bases'))})")
+            run_accession, title, spots, bases = (
+                record.get(field) for field in ('run_accession', 'title', 'spots', 'bases')
+            )
+            print(f"  run_accession: {run_accession} (type: {type(run_accession)})")
+            print(f"  title: {title} (type: {type(title)})")
+            print(f"  spots: {spots} (type: {type(spots)})")
+            print(f"  bases: {bases} (type: {type(bases)})")
             
             # Test safe conversion
-            spots_safe = safe_int_convert(record.get('spots'))
-            bases_safe = safe_int_convert(record.get('bases'))
+            spots_safe = safe_int_convert(spots)
+            bases_safe = safe_int_convert(bases)
             print(f"  spots_safe: {spots_safe} (type: {type(spots_safe)})")
             print(f"  bases_safe: {bases_safe} (type: {type(bases_safe)})")
             
@@ -80,9 +79,9 @@ def test_geo_loading():
         # Test data types
         for i, record in enumerate(geo_records[:3]):
             print(f"\nGEO Record {i+1}:")
-            print(f"  geo_accession: {record.get('geo_accession')} (type: {type(record.get('geo_accession'))})")
-            print(f"  title: {record.get('title')} (type: {type(record.get('title'))})")
-            print(f"  organism: {record.get('organism')} (type: {type(record.get('organism'))})")
+            for field in ('geo_accession', 'title', 'organism'):
+                value = record.get(field)
+                print(f"  {field}: {value} (type: {type(value)})")
                 
     except Exception as e:
         print(f"Error loading GEO data: {e}")
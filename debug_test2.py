@@ -3,12 +3,9 @@
 Debug script to test the comprehensive clean with detailed error tracking.
 """
 
-import sys
-import os
 import traceback
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'scAgent'))
 
-from scAgent.db.query import execute_query
+from scAgent.db.query import execute_queries_concurrently
 from scAgent.utils import (
     safe_int_convert, 
     build_geo_sra_mapping, 
@@ -21,8 +18,7 @@ def test_comprehensive_clean():
     print("=== Testing Comprehensive Clean Process ===")
     
     try:
-        # Step 1: Load SRA data
-        print("\n1. Loading SRA data...")
+        # Step 1: Define SRA query
         sra_query = """
         SELECT 
             run_accession,
@@ -62,11 +58,7 @@ def test_comprehensive_clean():
         LIMIT 10
         """
         
-        sra_records = execute_query(sra_query)
-        print(f"✓ Loaded {len(sra_records)} SRA records")
-        
-        # Step 2: Load GEO data
-        print("\n2. Loading GEO data...")
+        # Step 2: Define GEO query
         geo_query = """
         SELECT 
             "gse_ID" as geo_accession,
@@ -96,7 +88,11 @@ def test_comprehensive_clean():
         LIMIT 10
         """
         
-        geo_records = execute_query(geo_query)
+        # Both loads run on the server at the same time; repeat runs within
+        # five minutes reuse the cached samples instead of querying again
+        print("\n1-2. Loading SRA and GEO data...")
+        sra_records, geo_records = execute_queries_concurrently([sra_query, geo_query], cache_ttl=300)
+        print(f"✓ Loaded {len(sra_records)} SRA records")
         print(f"✓ Loaded {len(geo_records)} GEO records")
         
         # Step 3: Build mapping
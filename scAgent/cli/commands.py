@@ -1411,15 +1411,22 @@ def comprehensive_clean(args: argparse.Namespace) -> int:
             # Step 1: Load data
             task = progress.add_task("Loading data from tables...", total=None)
             
-            from ..db.query import execute_query
+            from ..db.query import execute_query, SRA_HUMAN_CANDIDATE_SQL, GEO_HUMAN_CANDIDATE_SQL
             
             all_records = []
             
+            # Optionally let Postgres drop obvious non-human rows before they are shipped
+            sql_prefilter = getattr(args, 'sql_prefilter', False) and all(
+                species.lower() in ("homo sapiens", "human")
+                for species in filter_config["required_species"]
+            )
+            
             # Load SRA data (primary source)
             if args.include_sra:
                 sra_limit = ""
                 if hasattr(args, 'limit') and args.limit:
                     sra_limit = f"LIMIT {args.limit}"
+                sra_species_filter = f"AND {SRA_HUMAN_CANDIDATE_SQL}" if sql_prefilter else ""
                 
                 # Prioritize human-related records
                 sra_query = f"""
@@ -1458,6 +1465,7 @@ def comprehensive_clean(args: argparse.Namespace) -> int:
                     'SRA' as data_source
                 FROM srameta.sra_master
                 WHERE "run_accession" IS NOT NULL AND "run_accession" != ''
+                {sra_species_filter}
                 ORDER BY "sra_ID" DESC
                 {sra_limit}
                 """
@@ -1471,6 +1479,7 @@ def comprehensive_clean(args: argparse.Namespace) -> int:
                 if hasattr(args, 'limit') and args.limit:
                     geo_limit_num = min(args.limit // 10, 1000)  # Use 10% of limit for GEO, max 1000
                     geo_limit = f"LIMIT {geo_limit_num}"
+                geo_species_filter = f"WHERE {GEO_HUMAN_CANDIDATE_SQL}" if sql_prefilter else ""
                 
                 # Prioritize human-related records
                 geo_query = f"""
@@ -1508,6 +1517,7 @@ def comprehensive_clean(args: argparse.Namespace) -> int:
                         ELSE 0 
                     END as human_priority
                 FROM geometa.geo_master
+                {geo_species_filter}
                 ORDER BY "gse_ID" DESC
                 {geo_limit}
                 """
@@ -264,6 +264,7 @@ def create_parser() -> argparse.ArgumentParser:
     clean_parser.add_argument('--no-ai', action='store_true', help='Disable AI filtering')
     clean_parser.add_argument('--ai-batch-size', type=int, default=5, help='Batch size for AI processing')
     clean_parser.add_argument('--limit', type=int, help='Limit number of records to process (for testing)')
+    clean_parser.add_argument('--sql-prefilter', action='store_true', help='Drop non-human records in SQL before assessment')
     clean_parser.set_defaults(func=comprehensive_clean)
     
     return parser
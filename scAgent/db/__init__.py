@@ -2,19 +2,27 @@
 Database connection and operations for scAgent.
 """
 
-from .connect import get_connection, test_connection
+from .connect import get_connection, get_connection_pool, pooled_connection, test_connection
 from .schema import analyze_table_schema, get_table_info, export_schema_report
 from .query import (
     query_geo_master, 
     query_sra_master, 
     execute_query, 
+    execute_query_stream,
+    execute_query_frame,
+    execute_queries_concurrently,
+    cached_query,
     find_scrna_datasets,
     export_query_results,
-    get_dataset_statistics
+    get_dataset_statistics,
+    SRA_HUMAN_CANDIDATE_SQL,
+    GEO_HUMAN_CANDIDATE_SQL
 )
 
 __all__ = [
     "get_connection",
+    "get_connection_pool",
+    "pooled_connection",
     "test_connection", 
     "analyze_table_schema",
     "get_table_info",
@@ -22,7 +30,13 @@ __all__ = [
     "query_geo_master",
     "query_sra_master",
     "execute_query",
+    "execute_query_stream",
+    "execute_query_frame",
+    "execute_queries_concurrently",
+    "cached_query",
     "find_scrna_datasets",
     "export_query_results",
-    "get_dataset_statistics"
+    "get_dataset_statistics",
+    "SRA_HUMAN_CANDIDATE_SQL",
+    "GEO_HUMAN_CANDIDATE_SQL"
 ] 
\ No newline at end of file
@@ -4,7 +4,10 @@ Database connection utilities for scAgent.
 
 import psycopg2
 import psycopg2.extras
-from typing import Optional, Dict, Any
+import psycopg2.pool
+import threading
+from contextlib import contextmanager
+from typing import Optional, Dict, Any, Iterator
 import logging
 from dynaconf import Dynaconf
 
@@ -25,6 +28,28 @@ settings = Dynaconf(
     load_dotenv=True,
 )
 
+# Shared connection pool, created on first use by get_connection_pool()
+_connection_pool: Optional[psycopg2.pool.ThreadedConnectionPool] = None
+_connection_pool_lock = threading.Lock()
+
+def _connection_params(
+    host: Optional[str] = None,
+    port: Optional[int] = None,
+    user: Optional[str] = None,
+    password: Optional[str] = None,
+    database: Optional[str] = None,
+    timeout: Optional[int] = None
+) -> Dict[str, Any]:
+    """Use provided values or fall back to config."""
+    return {
+        "host": host or settings.db_host,
+        "port": port or settings.db_port,
+        "user": user or settings.db_user,
+        "password": password or settings.db_password,
+        "database": database or getattr(settings, 'db_name', 'postgres'),
+        "connect_timeout": timeout or settings.db_timeout,
+    }
+
 def get_connection(
     host: Optional[str] = None,
     port: Optional[int] = None,
@@ -47,15 +72,7 @@ def get_connection(
     Returns:
         psycopg2 connection object
     """
-    # Use provided values or fall back to config
-    conn_params = {
-        "host": host or settings.db_host,
-        "port": port or settings.db_port,
-        "user": user or settings.db_user,
-        "password": password or settings.db_password,
-        "database": database or getattr(settings, 'db_name', 'postgres'),
-        "connect_timeout": timeout or settings.db_timeout,
-    }
+    conn_params = _connection_params(host, port, user, password, database, timeout)
     
     try:
         logger.info(f"Connecting to database at {conn_params['host']}:{conn_params['port']}")
@@ -67,6 +84,54 @@ def get_connection(
         logger.error(f"Failed to connect to database: {e}")
         raise
 
+def get_connection_pool(
+    minconn: int = 1,
+    maxconn: Optional[int] = None
+) -> psycopg2.pool.ThreadedConnectionPool:
+    """
+    Get the shared, thread-safe connection pool, creating it on first use.
+    
+    Args:
+        minconn: Connections opened up front
+        maxconn: Upper bound on open connections (defaults to config db_pool_size, or 5)
+        
+    Returns:
+        psycopg2 ThreadedConnectionPool using the configured connection settings
+    """
+    global _connection_pool
+    pool = _connection_pool
+    if pool is None or pool.closed:
+        # Threads fanning out before the pool exists must not each build
+        # (and leak) their own; re-check once the lock is held
+        with _connection_pool_lock:
+            pool = _connection_pool
+            if pool is None or pool.closed:
+                maxconn = maxconn or getattr(settings, 'db_pool_size', 5)
+                conn_params = _connection_params()
+                logger.info(f"Creating connection pool ({minconn}-{maxconn}) for {conn_params['host']}:{conn_params['port']}")
+                pool = psycopg2.pool.ThreadedConnectionPool(minconn, maxconn, **conn_params)
+                _connection_pool = pool
+    return pool
+
+@contextmanager
+def pooled_connection() -> Iterator[psycopg2.extensions.connection]:
+    """
+    Borrow a connection from the shared pool and return it afterwards.
+    
+    Reusing pooled connections skips the connect/authenticate round trips
+    that get_connection() pays on every call.
+    
+    Yields:
+        psycopg2 connection object in autocommit mode
+    """
+    pool = get_connection_pool()
+    conn = pool.getconn()
+    try:
+        conn.autocommit = True
+        yield conn
+    finally:
+        pool.putconn(conn)
+
 def test_connection(
     host: Optional[str] = None,
     port: Optional[int] = None,
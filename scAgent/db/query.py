@@ -4,13 +4,40 @@ Database query utilities for scAgent.
 
 import psycopg2
 import psycopg2.extras
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Optional, Tuple, Iterator
+import hashlib
 import logging
+import os
+import pickle
+import tempfile
+import time
+from pathlib import Path
+from uuid import uuid4
 import pandas as pd
-from .connect import get_connection, get_cursor
+from concurrent.futures import ThreadPoolExecutor
+from .connect import get_connection, get_connection_pool, pooled_connection, get_cursor, _connection_params
 
 logger = logging.getLogger(__name__)
 
+# Where cached_query keeps result sets between runs. Entries are pickles, and
+# unpickling runs arbitrary code, so this directory (including one chosen
+# through SCAGENT_QUERY_CACHE_DIR) must only be writable by trusted users.
+QUERY_CACHE_DIR = Path(os.environ.get("SCAGENT_QUERY_CACHE_DIR", Path.home() / ".cache" / "scAgent"))
+
+# Cheap index-backed predicates selecting human candidate rows. Records that
+# match are re-scored by the Python assessors; these only cut the rows shipped.
+# '%%' keeps them valid in parameterized queries and means the same to LIKE.
+SRA_HUMAN_CANDIDATE_SQL = """(
+    "taxon_id" = '9606'
+    OR LOWER("scientific_name") LIKE 'homo sapiens%%'
+    OR LOWER("common_name") LIKE 'human%%'
+)"""
+
+GEO_HUMAN_CANDIDATE_SQL = """(
+    LOWER("organism") LIKE '%%homo sapiens%%'
+    OR LOWER("organism_ch1") LIKE '%%homo sapiens%%'
+)"""
+
 def execute_query(
     query: str,
     params: Optional[Tuple] = None,
@@ -35,7 +62,9 @@ def execute_query(
         should_close = True
     
     try:
-        with get_cursor(conn, psycopg2.extras.RealDictCursor) as cur:
+        # Plain tuple rows zipped with the column names once: RealDictCursor
+        # builds each row through a Python __setitem__ call per column
+        with get_cursor(conn) as cur:
             cur.execute(query, params)
             
             if fetch_all:
@@ -43,7 +72,100 @@ def execute_query(
             else:
                 results = [cur.fetchone()]
             
-            return [dict(row) for row in results if row is not None]
+            columns = [column.name for column in cur.description]
+            return [dict(zip(columns, row)) for row in results if row is not None]
+            
+    except Exception as e:
+        logger.error(f"Error executing query: {e}")
+        logger.error(f"Query: {query}")
+        raise
+    finally:
+        if should_close:
+            conn.close()
+
+def execute_query_stream(
+    query: str,
+    params: Optional[Tuple] = None,
+    conn: Optional[psycopg2.extensions.connection] = None,
+    itersize: int = 1000
+) -> Iterator[Dict[str, Any]]:
+    """
+    Execute a SQL query and yield results through a server-side cursor.
+    
+    Rows are fetched from the server ``itersize`` at a time, so large result
+    sets never have to be held in memory at once.
+    
+    Args:
+        query: SQL query string
+        params: Query parameters (optional)
+        conn: Database connection (optional)
+        itersize: Number of rows fetched per network round trip
+        
+    Yields:
+        One dictionary per result row
+    """
+    should_close = False
+    if conn is None:
+        conn = get_connection()
+        should_close = True
+    
+    # Named cursors only live inside a transaction
+    autocommit = conn.autocommit
+    if autocommit:
+        conn.autocommit = False
+    try:
+        # A unique name lets several streams stay open on one connection
+        with conn.cursor(name=f"scagent_stream_{uuid4().hex}") as cur:
+            cur.itersize = itersize
+            cur.execute(query, params)
+            # A named cursor only has a description after its first fetch
+            columns = None
+            for row in cur:
+                if columns is None:
+                    columns = [column.name for column in cur.description]
+                yield dict(zip(columns, row))
+                
+    except Exception as e:
+        logger.error(f"Error executing query: {e}")
+        logger.error(f"Query: {query}")
+        raise
+    finally:
+        if autocommit:
+            conn.rollback()
+            conn.autocommit = True
+        if should_close:
+            conn.close()
+
+def execute_query_frame(
+    query: str,
+    params: Optional[Tuple] = None,
+    conn: Optional[psycopg2.extensions.connection] = None
+) -> pd.DataFrame:
+    """
+    Execute a SQL query and return the results as a column-oriented DataFrame.
+    
+    Rows are fetched as plain tuples and stored column by column, skipping
+    the per-row dictionaries that execute_query builds. Values keep their
+    Python types (object dtype), exactly as execute_query would return them.
+    
+    Args:
+        query: SQL query string
+        params: Query parameters (optional)
+        conn: Database connection (optional)
+        
+    Returns:
+        DataFrame with one column per selected column
+    """
+    should_close = False
+    if conn is None:
+        conn = get_connection()
+        should_close = True
+    
+    try:
+        with get_cursor(conn) as cur:
+            cur.execute(query, params)
+            columns = [column.name for column in cur.description]
+            return pd.DataFrame(cur.fetchall(), columns=columns, dtype=object)
             
     except Exception as e:
         logger.error(f"Error executing query: {e}")
@@ -53,6 +175,121 @@ def execute_query(
         if should_close:
             conn.close()
 
+def _query_cache_path(
+    query: str,
+    params: Optional[Tuple],
+    conn: Optional[psycopg2.extensions.connection] = None
+) -> Path:
+    # Key on the target database too, so two databases never share entries
+    if conn is not None:
+        dsn = conn.get_dsn_parameters()
+        database = (dsn.get("host"), dsn.get("port"), dsn.get("dbname"))
+    else:
+        conn_params = _connection_params()
+        database = (conn_params["host"], str(conn_params["port"]), conn_params["database"])
+    key = hashlib.sha256(repr((database, query, params)).encode("utf-8")).hexdigest()
+    return QUERY_CACHE_DIR / f"{key}.pkl"
+
+def _read_query_cache(path: Path, ttl_seconds: float) -> Optional[List[Dict[str, Any]]]:
+    try:
+        if time.time() - path.stat().st_mtime > ttl_seconds:
+            return None
+        with open(path, "rb") as f:
+            return pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError):
+        return None
+
+def _write_query_cache(path: Path, results: List[Dict[str, Any]]) -> None:
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write to a temporary file first so readers never see a partial pickle
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(results, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.warning(f"Could not write query cache {path}: {e}")
+
+def cached_query(
+    query: str,
+    params: Optional[Tuple] = None,
+    conn: Optional[psycopg2.extensions.connection] = None,
+    ttl_seconds: float = 300
+) -> List[Dict[str, Any]]:
+    """
+    execute_query with results cached on disk for repeated runs.
+    
+    Results are stored under QUERY_CACHE_DIR, keyed by the target database
+    (host, port, dbname), the query text and parameters, and reused while
+    younger than ``ttl_seconds``. A cache hit does not open a database
+    connection. Changes to the data within the TTL are not seen, so only use
+    it for read-only queries where slightly stale data is acceptable
+    (debugging, sampling).
+    
+    Args:
+        query: SQL query string
+        params: Query parameters (optional)
+        conn: Database connection used on a cache miss (optional)
+        ttl_seconds: Maximum age of a reusable cached result
+        
+    Returns:
+        List of dictionaries containing query results
+    """
+    path = _query_cache_path(query, params, conn)
+    results = _read_query_cache(path, ttl_seconds)
+    if results is not None:
+        logger.debug(f"Query cache hit: {path.name}")
+        return results
+    
+    results = execute_query(query, params, conn)
+    _write_query_cache(path, results)
+    return results
+
+def _execute_pooled(
+    query: str,
+    params: Optional[Tuple] = None,
+    cache_ttl: Optional[float] = None
+) -> List[Dict[str, Any]]:
+    if cache_ttl is not None:
+        path = _query_cache_path(query, params)
+        results = _read_query_cache(path, cache_ttl)
+        if results is not None:
+            return results
+    with pooled_connection() as conn:
+        results = execute_query(query, params, conn)
+    if cache_ttl is not None:
+        _write_query_cache(path, results)
+    return results
+
+def execute_queries_concurrently(
+    queries: List[str],
+    params: Optional[List[Optional[Tuple]]] = None,
+    cache_ttl: Optional[float] = None
+) -> List[List[Dict[str, Any]]]:
+    """
+    Execute independent SQL queries at the same time on pooled connections.
+    
+    The server runs the queries in parallel, so the total wait is roughly
+    that of the slowest query rather than the sum of all of them.
+    
+    Args:
+        queries: SQL query strings
+        params: Query parameters per query (optional)
+        cache_ttl: If set, reuse results cached by cached_query up to this many seconds old
+        
+    Returns:
+        One result list per query, in the order given
+    """
+    if not queries:
+        return []
+    
+    params = params or [None] * len(queries)
+    # The pool raises instead of waiting when it runs dry, so never run more
+    # queries at once than it has connections
+    max_workers = min(len(queries), get_connection_pool().maxconn)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(_execute_pooled, queries, params, [cache_ttl] * len(queries)))
+
 def query_geo_master(
     limit: int = 1000,
     offset: int = 0,
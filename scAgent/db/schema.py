@@ -5,13 +5,44 @@ Database schema analysis utilities for scAgent.
 import psycopg2
 import psycopg2.extras
 from typing import Dict, List, Any, Optional, Tuple
+from collections import defaultdict
 import logging
 import pandas as pd
 from .connect import get_connection, get_cursor
+from .query import _query_cache_path, _read_query_cache, _write_query_cache
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+def _table_stats(
+    cur: psycopg2.extensions.cursor,
+    table_names: List[str]
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Get the row count and total size of each table from the catalog.
+    
+    Row counts are the planner's pg_class.reltuples estimate, so large
+    tables are not scanned end to end; a table that has never been
+    vacuumed or analyzed (reltuples < 0) gets an exact COUNT(*) instead.
+    Expects a RealDictCursor.
+    """
+    cur.execute("""
+        SELECT 
+            t.table_name,
+            c.reltuples::bigint as row_count,
+            pg_size_pretty(pg_total_relation_size(c.oid)) as table_size
+        FROM unnest(%s::text[]) AS t(table_name)
+        JOIN pg_class c ON c.oid = t.table_name::regclass;
+    """, (list(table_names),))
+    stats = {row["table_name"]: dict(row) for row in cur.fetchall()}
+    
+    for table_name, row in stats.items():
+        if row["row_count"] < 0:
+            cur.execute(f"SELECT COUNT(*) as row_count FROM {table_name};")
+            row["row_count"] = cur.fetchone()["row_count"]
+    
+    return stats
+
 def analyze_table_schema(
     table_name: str,
     conn: Optional[psycopg2.extensions.connection] = None
@@ -52,15 +83,8 @@ def analyze_table_schema(
             
             columns = cur.fetchall()
             
-            # Get table statistics
-            cur.execute(f"""
-                SELECT 
-                    COUNT(*) as row_count,
-                    pg_size_pretty(pg_total_relation_size('{table_name}')) as table_size
-                FROM {table_name};
-            """)
-            
-            stats = cur.fetchone()
+            # Get table statistics (row count is an estimate, see _table_stats)
+            stats = _table_stats(cur, [table_name])[table_name]
             
             # Get sample data (first 5 rows)
             cur.execute(f"SELECT * FROM {table_name} LIMIT 5;")
@@ -117,9 +141,109 @@ def analyze_table_schema(
         if should_close:
             conn.close()
 
+def _analyze_tables_batched(
+    table_names: List[str],
+    conn: psycopg2.extensions.connection
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Analyze several tables with one catalog query per kind of metadata.
+    
+    Produces the same per-table dicts as analyze_table_schema, but the
+    column, size/row-estimate, index and foreign key lookups cover every
+    table at once; only the sample rows are still fetched table by table.
+    """
+    if not table_names:
+        return {}
+
+    with get_cursor(conn, psycopg2.extras.RealDictCursor) as cur:
+        cur.execute("""
+            SELECT 
+                table_name,
+                column_name,
+                data_type,
+                is_nullable,
+                column_default,
+                character_maximum_length,
+                numeric_precision,
+                numeric_scale,
+                ordinal_position
+            FROM information_schema.columns 
+            WHERE table_name = ANY(%s) 
+            AND table_schema = 'public'
+            ORDER BY table_name, ordinal_position;
+        """, (list(table_names),))
+        columns = cur.fetchall()
+        
+        stats = _table_stats(cur, table_names)
+        
+        sample_data = {}
+        for table_name in table_names:
+            cur.execute(f"SELECT * FROM {table_name} LIMIT 5;")
+            sample_data[table_name] = cur.fetchall()
+        
+        cur.execute("""
+            SELECT 
+                tablename,
+                indexname,
+                indexdef
+            FROM pg_indexes 
+            WHERE tablename = ANY(%s) 
+            AND schemaname = 'public';
+        """, (list(table_names),))
+        indexes = cur.fetchall()
+        
+        cur.execute("""
+            SELECT
+                tc.table_name,
+                tc.constraint_name,
+                kcu.column_name,
+                ccu.table_name AS foreign_table_name,
+                ccu.column_name AS foreign_column_name
+            FROM information_schema.table_constraints AS tc
+            JOIN information_schema.key_column_usage AS kcu
+                ON tc.constraint_name = kcu.constraint_name
+                AND tc.table_schema = kcu.table_schema
+            JOIN information_schema.constraint_column_usage AS ccu
+                ON ccu.constraint_name = tc.constraint_name
+                AND ccu.table_schema = tc.table_schema
+            WHERE tc.constraint_type = 'FOREIGN KEY'
+            AND tc.table_name = ANY(%s)
+            AND tc.table_schema = 'public';
+        """, (list(table_names),))
+        foreign_keys = cur.fetchall()
+    
+    # Group the catalog rows back by table, dropping the grouping column
+    table_columns = defaultdict(list)
+    for col in columns:
+        col = dict(col)
+        table_columns[col.pop("table_name")].append(col)
+    table_indexes = defaultdict(list)
+    for idx in indexes:
+        idx = dict(idx)
+        table_indexes[idx.pop("tablename")].append(idx)
+    table_foreign_keys = defaultdict(list)
+    for fk in foreign_keys:
+        fk = dict(fk)
+        table_foreign_keys[fk.pop("table_name")].append(fk)
+    
+    return {
+        table_name: {
+            "table_name": table_name,
+            "columns": table_columns[table_name],
+            "row_count": stats[table_name]["row_count"],
+            "table_size": stats[table_name]["table_size"],
+            "sample_data": [dict(row) for row in sample_data[table_name]],
+            "indexes": table_indexes[table_name],
+            "foreign_keys": table_foreign_keys[table_name],
+            "column_count": len(table_columns[table_name])
+        }
+        for table_name in table_names
+    }
+
 def get_table_info(
     table_names: List[str] = None,
-    conn: Optional[psycopg2.extensions.connection] = None
+    conn: Optional[psycopg2.extensions.connection] = None,
+    cache_ttl: Optional[float] = None
 ) -> Dict[str, Dict[str, Any]]:
     """
     Get information about multiple tables.
@@ -127,6 +251,8 @@ def get_table_info(
     Args:
         table_names: List of table names to analyze (defaults to geo_master, sra_master)
         conn: Database connection (optional)
+        cache_ttl: If set, reuse a result cached on disk (next to cached_query's)
+            up to this many seconds old; results with errors are never cached
         
     Returns:
         Dict mapping table names to their schema information
@@ -134,12 +260,39 @@ def get_table_info(
     if table_names is None:
         table_names = ["geo_master", "sra_master"]
     
+    if cache_ttl is not None:
+        cache_path = _query_cache_path("get_table_info", tuple(table_names), conn)
+        table_info = _read_query_cache(cache_path, cache_ttl)
+        if table_info is not None:
+            logger.debug(f"Schema cache hit: {cache_path.name}")
+            return table_info
+    
+    table_info = _get_table_info_uncached(table_names, conn)
+    if cache_ttl is not None and not any("error" in info for info in table_info.values()):
+        _write_query_cache(cache_path, table_info)
+    return table_info
+
+def _get_table_info_uncached(
+    table_names: List[str],
+    conn: Optional[psycopg2.extensions.connection] = None
+) -> Dict[str, Dict[str, Any]]:
     should_close = False
     if conn is None:
         conn = get_connection()
         should_close = True
     
     try:
+        try:
+            table_info = _analyze_tables_batched(table_names, conn)
+            logger.info(f"Successfully analyzed schema for tables: {', '.join(table_names)}")
+            return table_info
+        except Exception as e:
+            # One bad table fails the whole batch; redo it table by table so
+            # the others still get analyzed and the error lands on the culprit
+            logger.warning(f"Batched schema analysis failed, analyzing tables one by one: {e}")
+            if not conn.autocommit:
+                conn.rollback()
+        
         table_info = {}
         for table_name in table_names:
             try:
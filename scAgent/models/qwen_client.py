@@ -41,6 +41,9 @@ class QwenClient(BaseModel):
         self.headers = {
             "Content-Type": "application/json"
         }
+        # Keep-alive session so repeated calls reuse the open HTTP connection
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
         
     def generate(
         self,
@@ -97,9 +100,8 @@ class QwenClient(BaseModel):
             logger.debug(f"Sending request to {self.api_url}")
             logger.debug(f"Request params: {json.dumps(request_params, indent=2)}")
             
-            response = requests.post(
+            response = self.session.post(
                 self.api_url,
-                headers=self.headers,
                 json=request_params,
                 timeout=60
             )
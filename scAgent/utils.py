@@ -3,7 +3,8 @@ Utility functions for scAgent.
 """
 
 import re
-from typing import List, Dict, Any, Optional
+from collections import defaultdict
+from typing import List, Dict, Any, Optional, Tuple
 import logging
 from datetime import datetime
 
@@ -27,6 +28,13 @@ def safe_int_convert(value) -> int:
     except (ValueError, TypeError):
         return 0
 
+def truncate_text(value: Any, width: int = 50, placeholder: str = 'None') -> str:
+    """Shorten a value for display, appending '...' only when it was cut."""
+    if value is None or value == '':
+        return placeholder
+    text = str(value)
+    return text[:width] + '...' if len(text) > width else text
+
 def generate_sra_download_commands(sra_records: List[Dict[str, Any]]) -> List[str]:
     """
     Generate SRA download commands for a list of SRA records.
@@ -2209,6 +2217,12 @@ def generate_filter_report(
     
     return report
 
+# GEO series accession as cited in SRA study text
+GEO_ACCESSION_RE = re.compile(r'GSE\d+')
+
+# Words ignored by calculate_text_similarity
+TEXT_SIMILARITY_STOP_WORDS = frozenset({'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 'from', 'is', 'are', 'was', 'were', 'be', 'been', 'being', 'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could', 'should'})
+
 def build_geo_sra_mapping(
     geo_records: List[Dict[str, Any]],
     sra_records: List[Dict[str, Any]]
@@ -2229,12 +2243,12 @@ def build_geo_sra_mapping(
         "orphaned_geo": [],  # GEO records without SRA matches
         "orphaned_sra": [],  # SRA records without GEO matches
         "mapping_stats": {},
-        "mapping_methods": []
+        "mapping_methods": [],
+        "similarity_scores": {}  # SRA accession -> similarity to its matched GEO record
     }
     
     # Create lookup dictionaries
     geo_lookup = {record.get('geo_accession', ''): record for record in geo_records}
-    sra_lookup = {record.get('run_accession', ''): record for record in sra_records}
     
     # Method 1: Direct GEO accession matching in SRA records
     for sra_record in sra_records:
@@ -2242,8 +2256,7 @@ def build_geo_sra_mapping(
         study_abstract = (sra_record.get('study_abstract') or '').upper()
         
         # Look for GEO accession patterns in SRA text
-        import re
-        geo_patterns = re.findall(r'GSE\d+', study_title + ' ' + study_abstract)
+        geo_patterns = GEO_ACCESSION_RE.findall(study_title + ' ' + study_abstract)
         
         for geo_acc in geo_patterns:
             if geo_acc in geo_lookup:
@@ -2254,27 +2267,40 @@ def build_geo_sra_mapping(
                 mapping["sra_to_geo"][sra_record.get('run_accession', '')] = geo_acc
     
     # Method 2: Title and organism similarity matching
+    # Without a shared title word the similarity is at most 0.6, below the
+    # 0.7 threshold, so only SRA records found through the title-word index
+    # are scored. Features are extracted once per record, not once per pair.
+    sra_features = [_similarity_features(record, 'study_title') for record in sra_records]
+    sra_by_word = defaultdict(list)
+    for index, features in enumerate(sra_features):
+        if features[0]:
+            for word in features[1]:
+                sra_by_word[word].append(index)
+    
     for geo_record in geo_records:
         geo_acc = geo_record.get('geo_accession', '')
         if geo_acc in mapping["geo_to_sra"]:
             continue  # Already matched
-            
-        geo_title = (geo_record.get('title') or '').lower()
-        geo_organism = (geo_record.get('organism') or '').lower()
+        
+        geo_features = _similarity_features(geo_record, 'title')
+        if not geo_features[0]:
+            continue
+        
+        # Candidates are visited in SRA record order, like a full scan would
+        candidates = sorted({
+            index for word in geo_features[1] for index in sra_by_word.get(word, ())
+        })
         
         # Find potential SRA matches
         potential_matches = []
         
-        for sra_record in sra_records:
-            sra_acc = sra_record.get('run_accession', '')
+        for index in candidates:
+            sra_acc = sra_records[index].get('run_accession', '')
             if sra_acc in mapping["sra_to_geo"]:
                 continue  # Already matched
-                
-            sra_title = (sra_record.get('study_title') or '').lower()
-            sra_organism = (sra_record.get('organism') or '').lower()
             
             # Calculate similarity score
-            similarity_score = calculate_record_similarity(geo_record, sra_record)
+            similarity_score = _features_similarity(geo_features, sra_features[index])
             
             if similarity_score > 0.7:  # High similarity threshold
                 potential_matches.append((sra_acc, similarity_score))
@@ -2284,10 +2310,16 @@ def build_geo_sra_mapping(
         
         if potential_matches:
             mapping["geo_to_sra"][geo_acc] = [match[0] for match in potential_matches[:5]]  # Top 5 matches
-            for sra_acc, _ in potential_matches[:5]:
+            for sra_acc, similarity_score in potential_matches[:5]:
                 mapping["sra_to_geo"][sra_acc] = geo_acc
+                mapping["similarity_scores"][sra_acc] = similarity_score
     
     # Method 3: Sample count and date proximity matching
+    # Organism must match exactly, so only same-organism SRA records are visited
+    sra_by_organism = defaultdict(list)
+    for sra_record in sra_records:
+        sra_by_organism[(sra_record.get('organism', '') or '').lower()].append(sra_record)
+    
     for geo_record in geo_records:
         geo_acc = geo_record.get('geo_accession', '')
         if geo_acc in mapping["geo_to_sra"]:
@@ -2298,18 +2330,13 @@ def build_geo_sra_mapping(
         geo_organism = geo_record.get('organism', '') or ''
         
         # Find SRA records with similar characteristics
-        for sra_record in sra_records:
+        for sra_record in sra_by_organism.get(geo_organism.lower(), ()):
             sra_acc = sra_record.get('run_accession', '')
             if sra_acc in mapping["sra_to_geo"]:
                 continue
                 
-            sra_organism = sra_record.get('organism', '') or ''
             sra_date = sra_record.get('submission_date', '') or ''
             
-            # Check organism match
-            if geo_organism.lower() != sra_organism.lower():
-                continue
-                
             # Check date proximity (within 6 months)
             if geo_date and sra_date:
                 date_diff = calculate_date_difference(geo_date, sra_date)
@@ -2348,34 +2375,7 @@ def build_geo_sra_mapping(
     
     return mapping
 
-def calculate_record_similarity(geo_record: Dict[str, Any], sra_record: Dict[str, Any]) -> float:
-    """Calculate similarity score between GEO and SRA records."""
-    score = 0.0
-    
-    # Title similarity
-    geo_title = (geo_record.get('title') or '').lower()
-    sra_title = (sra_record.get('study_title') or '').lower()
-    
-    if geo_title and sra_title:
-        title_similarity = calculate_text_similarity(geo_title, sra_title)
-        score += title_similarity * 0.4
-    
-    # Organism match
-    geo_organism = (geo_record.get('organism') or '').lower()
-    sra_organism = (sra_record.get('organism') or '').lower()
-    
-    if geo_organism == sra_organism:
-        score += 0.3
-    
-    # Platform similarity
-    geo_platform = (geo_record.get('platform') or '').lower()
-    sra_platform = (sra_record.get('platform') or '').lower()
-    
-    if geo_platform and sra_platform:
-        if geo_platform in sra_platform or sra_platform in geo_platform:
-            score += 0.2
-    
-    # Sample count proximity
+def _geo_sample_count(geo_record: Dict[str, Any]) -> Any:
     # Safely convert sample count to integer
     try:
         geo_samples = geo_record.get('sample_count', 0)
@@ -2383,7 +2383,9 @@ def calculate_record_similarity(geo_record: Dict[str, Any], sra_record: Dict[str
             geo_samples = int(geo_samples) if geo_samples.isdigit() else 0
     except (ValueError, TypeError):
         geo_samples = 0
-    
+    return geo_samples
+
+def _sra_sample_count(sra_record: Dict[str, Any]) -> Any:
     # Safely convert spots to integer
     try:
         sra_spots = sra_record.get('spots', 0)
@@ -2392,27 +2394,54 @@ def calculate_record_similarity(geo_record: Dict[str, Any], sra_record: Dict[str
         sra_samples = sra_spots // 1000000  # Rough conversion
     except (ValueError, TypeError):
         sra_samples = 0
+    return sra_samples
+
+def _similarity_features(record: Dict[str, Any], title_key: str) -> Tuple:
+    """(title, title words, organism, platform, sample count) used by calculate_record_similarity."""
+    title = (record.get(title_key) or '').lower()
+    samples = _geo_sample_count(record) if title_key == 'title' else _sra_sample_count(record)
+    return (
+        title,
+        set(title.split()) - TEXT_SIMILARITY_STOP_WORDS,
+        (record.get('organism') or '').lower(),
+        (record.get('platform') or '').lower(),
+        samples,
+    )
+
+def _features_similarity(geo_features: Tuple, sra_features: Tuple) -> float:
+    geo_title, geo_words, geo_organism, geo_platform, geo_samples = geo_features
+    sra_title, sra_words, sra_organism, sra_platform, sra_samples = sra_features
+    score = 0.0
+    
+    # Title similarity
+    if geo_title and sra_title:
+        title_similarity = _word_set_similarity(geo_words, sra_words)
+        score += title_similarity * 0.4
+    
+    # Organism match
+    if geo_organism == sra_organism:
+        score += 0.3
+    
+    # Platform similarity
+    if geo_platform and sra_platform:
+        if geo_platform in sra_platform or sra_platform in geo_platform:
+            score += 0.2
     
+    # Sample count proximity
     if geo_samples > 0 and sra_samples > 0:
         ratio = min(geo_samples, sra_samples) / max(geo_samples, sra_samples)
         score += ratio * 0.1
     
     return min(score, 1.0)
 
-def calculate_text_similarity(text1: str, text2: str) -> float:
-    """Calculate text similarity using simple word overlap."""
-    if not text1 or not text2:
-        return 0.0
-    
-    words1 = set(text1.lower().split())
-    words2 = set(text2.lower().split())
-    
-    # Remove common stop words
-    stop_words = {'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 'from', 'is', 'are', 'was', 'were', 'be', 'been', 'being', 'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could', 'should'}
-    
-    words1 = words1 - stop_words
-    words2 = words2 - stop_words
-    
+def calculate_record_similarity(geo_record: Dict[str, Any], sra_record: Dict[str, Any]) -> float:
+    """Calculate similarity score between GEO and SRA records."""
+    return _features_similarity(
+        _similarity_features(geo_record, 'title'),
+        _similarity_features(sra_record, 'study_title')
+    )
+
+def _word_set_similarity(words1: set, words2: set) -> float:
     if not words1 or not words2:
         return 0.0
     
@@ -2421,6 +2450,17 @@ def calculate_text_similarity(text1: str, text2: str) -> float:
     
     return len(intersection) / len(union)
 
+def calculate_text_similarity(text1: str, text2: str) -> float:
+    """Calculate text similarity using simple word overlap."""
+    if not text1 or not text2:
+        return 0.0
+    
+    # Remove common stop words
+    words1 = set(text1.lower().split()) - TEXT_SIMILARITY_STOP_WORDS
+    words2 = set(text2.lower().split()) - TEXT_SIMILARITY_STOP_WORDS
+    
+    return _word_set_similarity(words1, words2)
+
 def calculate_date_difference(date1: str, date2: str) -> int:
     """Calculate difference in days between two dates."""
     try:
@@ -2534,6 +2574,9 @@ def create_integrated_dataset_table(
     download_links = generate_fastq_download_links(sra_records)
     download_lookup = {link['run_accession']: link for link in download_links}
     
+    # Scores already computed while building the mapping
+    similarity_scores = mapping.get("similarity_scores", {})
+    
     # Process mapped GEO records
     for geo_acc, sra_list in mapping["geo_to_sra"].items():
         geo_record = geo_lookup.get(geo_acc, {})
@@ -2567,7 +2610,10 @@ def create_integrated_dataset_table(
                 
                 # Relationship Information
                 "relationship_type": "geo_to_sra",
-                "mapping_confidence": calculate_record_similarity(geo_record, sra_record),
+                "mapping_confidence": (
+                    similarity_scores[sra_acc] if sra_acc in similarity_scores
+                    else calculate_record_similarity(geo_record, sra_record)
+                ),
                 
                 # Download Information
                 "fastq_download_url": download_info.get('sra_url', ''),
@@ -2676,6 +2722,27 @@ def create_integrated_dataset_table(
     
     return integrated_table
 
+def integrate_geo_sra(
+    geo_records: List[Dict[str, Any]],
+    sra_records: List[Dict[str, Any]]
+) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """
+    Build the GEO-SRA mapping and the integrated dataset table in one call.
+    
+    Similarity scores computed while matching are carried over as the
+    mapping confidence of the integrated records instead of being recomputed.
+    
+    Args:
+        geo_records: List of GEO records
+        sra_records: List of SRA records
+        
+    Returns:
+        Tuple of (integrated dataset table, mapping information)
+    """
+    mapping = build_geo_sra_mapping(geo_records, sra_records)
+    integrated_table = create_integrated_dataset_table(geo_records, sra_records, mapping)
+    return integrated_table, mapping
+
 def calculate_data_completeness(geo_record: Dict[str, Any], sra_record: Dict[str, Any]) -> float:
     """Calculate data completeness score."""
     score = 0.0
@@ -3376,6 +3443,23 @@ def apply_intelligent_sc_eqtl_filters(
     
     logger.info(f"Starting intelligent filtering for {len(records)} records")
     
+    # Resolve the config once: which checks run is fixed for the whole batch,
+    # so the per-record loops below only call the selected assessors.
+    exclude_cell_lines = filter_config["exclude_cell_lines"]
+    min_quality_score = filter_config.get("min_quality_score", 2)
+    required_species = filter_config["required_species"]
+    assess_species = assess_species_with_confidence  # may be patched, so bind at call time
+    phase2_assessors = (
+        ("species", lambda record: assess_species(record, required_species)),
+        ("publication", assess_publication_with_confidence),
+        ("sample_size", assess_sample_size_with_confidence),
+        ("country", assess_country_with_confidence),
+        ("age", assess_age_with_confidence),
+        ("tumor", assess_tumor_with_confidence),
+        ("sequencing_method", assess_sequencing_method_with_confidence),
+        ("tissue", assess_tissue_source_with_confidence)
+    )
+    
     # Phase 1: Critical filters (immediate rejection)
     phase1_passed = []
     phase1_stats = {"total": len(records), "critical_failures": 0}
@@ -3403,7 +3487,7 @@ def apply_intelligent_sc_eqtl_filters(
             continue
         
         # Critical Filter 2: Cell Line Exclusion (must not be cell line if required)
-        if filter_config["exclude_cell_lines"]:
+        if exclude_cell_lines:
             cell_line_result = assess_cell_line_with_confidence(record)
             filter_result["filter_details"]["cell_line"] = cell_line_result
             
@@ -3433,16 +3517,7 @@ def apply_intelligent_sc_eqtl_filters(
         filter_result["phase"] = "confidence_assessment"
         
         # Assess all remaining filters with confidence
-        assessments = {
-            "species": assess_species_with_confidence(record, filter_config["required_species"]),
-            "publication": assess_publication_with_confidence(record),
-            "sample_size": assess_sample_size_with_confidence(record),
-            "country": assess_country_with_confidence(record),
-            "age": assess_age_with_confidence(record),
-            "tumor": assess_tumor_with_confidence(record),
-            "sequencing_method": assess_sequencing_method_with_confidence(record),
-            "tissue": assess_tissue_source_with_confidence(record)
-        }
+        assessments = {name: assess(record) for name, assess in phase2_assessors}
         
         # Add cell line assessment if not already done
         if "cell_line" not in filter_result["filter_details"]:
@@ -3473,7 +3548,7 @@ def apply_intelligent_sc_eqtl_filters(
         # Decision logic
         if len(uncertain_filters) == 0:
             # High confidence decision
-            if total_score >= filter_config.get("min_quality_score", 2):
+            if total_score >= min_quality_score:
                 filter_result["decision"] = "accept_high_confidence"
                 phase2_passed.append(record)
                 phase2_stats["high_confidence_pass"] += 1
@@ -3513,6 +3588,44 @@ def apply_intelligent_sc_eqtl_filters(
     return phase2_passed
 
 
+# Keyword sets for the critical (phase 1) assessments. Order matters: the first
+# listed keyword found in the text is the one reported as evidence.
+SRA_ID_PREFIXES = ('SRR', 'SRP', 'ERR', 'DRR')
+
+HUMAN_SPECIES_INDICATORS = (
+    'human patient', 'human subject', 'human clinical', 'human cancer',
+    'human tumor', 'human tissue', 'human blood', 'human cell', 'human'
+)
+CLINICAL_INDICATORS = (
+    'patient', 'clinical', 'cancer', 'tumor', 'carcinoma',
+    'adenocarcinoma', 'breast cancer', 'lung cancer'
+)
+NON_HUMAN_INDICATORS = (
+    'mouse', 'rat', 'drosophila', 'zebrafish', 'yeast',
+    'arabidopsis', 'caenorhabditis', 'escherichia'
+)
+
+STRONG_CELL_LINE_KEYWORDS = (
+    'hela', '293t', 'hek293', 'k562', 'jurkat', 'mcf7', 'a549',
+    'cell line', 'cell-line', 'immortalized cell line'
+)
+WEAK_CELL_LINE_KEYWORDS = ('immortalized', 'transformed cell')
+PRIMARY_TISSUE_INDICATORS = ('primary', 'fresh', 'tissue', 'biopsy', 'patient', 'clinical')
+
+def _first_keyword(keywords, text: str) -> Optional[str]:
+    """
+    First of ``keywords`` (in list order) contained in ``text``, or None.
+    
+    Plain substring tests are used deliberately: for keyword lists this short,
+    CPython's str search beats a compiled alternation regex, which has no
+    multi-literal prefilter and retries every alternative at each position.
+    """
+    for keyword in keywords:
+        if keyword in text:
+            return keyword
+    return None
+
+
 def assess_database_id_with_confidence(record: Dict[str, Any]) -> Dict[str, Any]:
     """Assess database ID availability with confidence score."""
     # Check for GEO IDs (multiple possible field names)
@@ -3529,8 +3642,7 @@ def assess_database_id_with_confidence(record: Dict[str, Any]) -> Dict[str, Any]
     
     if geo_accession and geo_accession.startswith('GSE'):
         return {"score": 2, "confidence": 1.0, "reason": f"Valid GEO ID: {geo_accession}", "evidence": geo_accession}
-    elif sra_accession and (sra_accession.startswith('SRR') or sra_accession.startswith('SRP') or 
-                           sra_accession.startswith('ERR') or sra_accession.startswith('DRR')):
+    elif sra_accession and sra_accession.startswith(SRA_ID_PREFIXES):
         return {"score": 2, "confidence": 1.0, "reason": f"Valid SRA ID: {sra_accession}", "evidence": sra_accession}
     else:
         return {"score": 0, "confidence": 1.0, "reason": "No valid database ID found", "evidence": f"geo:{geo_accession}, sra:{sra_accession}"}
@@ -3582,18 +3694,12 @@ def assess_species_with_confidence(record: Dict[str, Any], required_species: Lis
         return {"score": 2, "confidence": 0.8, "reason": "Homo sapiens in text content", "evidence": "Found in title/summary/description"}
     
     # Human-specific indicators (lower confidence)
-    human_indicators = [
-        'human patient', 'human subject', 'human clinical', 'human cancer', 
-        'human tumor', 'human tissue', 'human blood', 'human cell', 'human'
-    ]
-    
-    for indicator in human_indicators:
-        if indicator in text_content:
-            return {"score": 2, "confidence": 0.7, "reason": f"Human indicator: {indicator}", "evidence": indicator}
+    indicator = _first_keyword(HUMAN_SPECIES_INDICATORS, text_content)
+    if indicator:
+        return {"score": 2, "confidence": 0.7, "reason": f"Human indicator: {indicator}", "evidence": indicator}
     
     # Medical/clinical context indicators (medium confidence - often human)
-    clinical_indicators = ['patient', 'clinical', 'cancer', 'tumor', 'carcinoma', 'adenocarcinoma', 'breast cancer', 'lung cancer']
-    clinical_matches = [ind for ind in clinical_indicators if ind in text_content]
+    clinical_matches = [ind for ind in CLINICAL_INDICATORS if ind in text_content]
     
     if len(clinical_matches) >= 2:
         return {"score": 2, "confidence": 0.6, "reason": f"Multiple clinical indicators (likely human): {clinical_matches}", "evidence": str(clinical_matches)}
@@ -3601,28 +3707,15 @@ def assess_species_with_confidence(record: Dict[str, Any], required_species: Lis
         return {"score": 1, "confidence": 0.5, "reason": f"Single clinical indicator: {clinical_matches[0]}", "evidence": clinical_matches[0]}
     
     # Check for non-human species indicators
-    non_human_indicators = ['mouse', 'rat', 'drosophila', 'zebrafish', 'yeast', 'arabidopsis', 'caenorhabditis', 'escherichia']
-    for indicator in non_human_indicators:
-        if indicator in text_content:
-            return {"score": 0, "confidence": 0.9, "reason": f"Non-human species detected: {indicator}", "evidence": indicator}
+    indicator = _first_keyword(NON_HUMAN_INDICATORS, text_content)
+    if indicator:
+        return {"score": 0, "confidence": 0.9, "reason": f"Non-human species detected: {indicator}", "evidence": indicator}
     
     return {"score": 0, "confidence": 0.8, "reason": "No human species indicators found", "evidence": "No matches in organism or text fields"}
 
 
 def assess_cell_line_with_confidence(record: Dict[str, Any]) -> Dict[str, Any]:
     """Assess cell line exclusion with confidence."""
-    # Known cell line identifiers (high confidence)
-    strong_cell_line_keywords = [
-        'hela', '293t', 'hek293', 'k562', 'jurkat', 'mcf7', 'a549',
-        'cell line', 'cell-line', 'immortalized cell line'
-    ]
-    
-    # Weaker indicators (lower confidence)
-    weak_cell_line_keywords = ['immortalized', 'transformed cell']
-    
-    # Primary tissue indicators (evidence against cell line)
-    primary_indicators = ['primary', 'fresh', 'tissue', 'biopsy', 'patient', 'clinical']
-    
     text_fields = [
         (record.get('gse_title') or record.get('study_title') or '').lower(),
         (record.get('summary') or record.get('study_abstract') or '').lower(),
@@ -3633,27 +3726,27 @@ def assess_cell_line_with_confidence(record: Dict[str, Any]) -> Dict[str, Any]:
     
     text_content = ' '.join(text_fields)
     
-    # Check for strong cell line indicators
-    for keyword in strong_cell_line_keywords:
-        if keyword in text_content:
-            # Check for primary tissue context
-            primary_count = sum(1 for indicator in primary_indicators if indicator in text_content)
-            if primary_count >= 2:
-                return {"score": 1, "confidence": 0.4, "reason": f"Cell line keyword '{keyword}' but primary context", "evidence": f"{keyword} + primary indicators"}
-            else:
-                return {"score": 0, "confidence": 0.9, "reason": f"Strong cell line indicator: {keyword}", "evidence": keyword}
+    # Primary tissue indicators (evidence against cell line)
+    primary_count = sum(1 for indicator in PRIMARY_TISSUE_INDICATORS if indicator in text_content)
+    
+    # Check for strong cell line indicators (high confidence)
+    keyword = _first_keyword(STRONG_CELL_LINE_KEYWORDS, text_content)
+    if keyword:
+        # Check for primary tissue context
+        if primary_count >= 2:
+            return {"score": 1, "confidence": 0.4, "reason": f"Cell line keyword '{keyword}' but primary context", "evidence": f"{keyword} + primary indicators"}
+        else:
+            return {"score": 0, "confidence": 0.9, "reason": f"Strong cell line indicator: {keyword}", "evidence": keyword}
     
-    # Check for weak cell line indicators
-    for keyword in weak_cell_line_keywords:
-        if keyword in text_content:
-            primary_count = sum(1 for indicator in primary_indicators if indicator in text_content)
-            if primary_count >= 2:
-                return {"score": 2, "confidence": 0.6, "reason": f"Weak cell line keyword but strong primary context", "evidence": f"{keyword} + primary context"}
-            else:
-                return {"score": 1, "confidence": 0.3, "reason": f"Weak cell line indicator: {keyword}", "evidence": keyword}
+    # Check for weak cell line indicators (lower confidence)
+    keyword = _first_keyword(WEAK_CELL_LINE_KEYWORDS, text_content)
+    if keyword:
+        if primary_count >= 2:
+            return {"score": 2, "confidence": 0.6, "reason": f"Weak cell line keyword but strong primary context", "evidence": f"{keyword} + primary context"}
+        else:
+            return {"score": 1, "confidence": 0.3, "reason": f"Weak cell line indicator: {keyword}", "evidence": keyword}
     
     # No cell line indicators found
-    primary_count = sum(1 for indicator in primary_indicators if indicator in text_content)
     if primary_count >= 2:
         return {"score": 2, "confidence": 0.8, "reason": "Strong primary tissue indicators", "evidence": f"Primary indicators: {primary_count}"}
     elif primary_count == 1:
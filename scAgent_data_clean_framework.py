@@ -15,17 +15,36 @@ Key Features:
 """
 
 import logging
-from typing import Dict, List, Any, Optional, Tuple
+from collections import Counter
+from typing import Dict, List, Any, Iterable, Iterator, Optional, Tuple
 from datetime import datetime
 import json
+import time
 
 logger = logging.getLogger(__name__)
 
+def _first_keyword(keywords: Tuple[str, ...], text: str) -> Optional[str]:
+    """Return the first of ``keywords`` (in precedence order) found in ``text``."""
+    for keyword in keywords:
+        if keyword in text:
+            return keyword
+    return None
+
 class ScAgentDataCleaningFramework:
     """
     Comprehensive data cleaning framework for scAgent.
     """
     
+    # Keyword sets scanned by the assessors, built once per process.
+    # Order is precedence: the first keyword found is reported as evidence.
+    HUMAN_INDICATORS = ('human', 'patient', 'clinical')
+    NON_HUMAN_INDICATORS = ('mouse', 'rat', 'drosophila', 'zebrafish')
+    CELL_LINE_KEYWORDS = ('hela', 'hek293', '293t', 'jurkat', 'k562', 'cell line')
+    PRIMARY_INDICATORS = ('primary', 'tissue', 'biopsy', 'patient', 'clinical')
+    
+    # Record key holding the per-record text cache built by _extract_text
+    TEXT_CACHE_KEY = '_sc_text_cache'
+    
     def __init__(self, config: Optional[Dict[str, Any]] = None):
         """Initialize the framework with configuration."""
         self.config = self._get_default_config()
@@ -38,7 +57,7 @@ class ScAgentDataCleaningFramework:
             "phase2_passed": 0,
             "phase3_passed": 0,
             "final_passed": 0,
-            "rejection_reasons": {},
+            "rejection_reasons": Counter(),
             "processing_time": 0
         }
     
@@ -95,15 +114,17 @@ class ScAgentDataCleaningFramework:
         Returns:
             Tuple of (cleaned_records, cleaning_report)
         """
-        start_time = datetime.now()
+        start_time = time.perf_counter()
         logger.info(f"Starting comprehensive data cleaning for {len(records)} records")
         
-        # Phase 1: Critical Filters (Hard Requirements)
+        # Phase 1: Critical Filters (Hard Requirements), streamed straight into
+        # Phase 2: Confidence-based Filters, so no list of phase 1 survivors is built
         phase1_results = self._apply_critical_filters(records)
-        logger.info(f"Phase 1: {len(phase1_results)} / {len(records)} passed critical filters")
-        
-        # Phase 2: Confidence-based Filters
         phase2_results = self._apply_confidence_filters(phase1_results)
+        
+        # Every phase 1 survivor lands in exactly one phase 2 bucket
+        phase1_passed = len(phase2_results['high_confidence']) + len(phase2_results['uncertain'])
+        logger.info(f"Phase 1: {phase1_passed} / {len(records)} passed critical filters")
         logger.info(f"Phase 2: {len(phase2_results['high_confidence'])} high-confidence, "
                    f"{len(phase2_results['uncertain'])} uncertain")
         
@@ -121,11 +142,11 @@ class ScAgentDataCleaningFramework:
         # Update statistics
         self.stats.update({
             "total_processed": len(records),
-            "phase1_passed": len(phase1_results),
+            "phase1_passed": phase1_passed,
             "phase2_passed": len(phase2_results['high_confidence']),
             "phase3_passed": len(phase3_results),
             "final_passed": len(final_results),
-            "processing_time": (datetime.now() - start_time).total_seconds()
+            "processing_time": time.perf_counter() - start_time
         })
         
         # Generate comprehensive report
@@ -136,35 +157,41 @@ class ScAgentDataCleaningFramework:
         
         return final_results, report
     
-    def _apply_critical_filters(self, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Apply critical filters that must pass."""
-        passed_records = []
+    def _apply_critical_filters(self, records: List[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """Apply critical filters that must pass, yielding records as they pass."""
+        # Settings are read once per run rather than once per record
+        require_database_id = self.config["require_database_id"]
+        species_threshold = self.config["species_confidence_threshold"]
+        exclude_cell_lines = self.config["exclude_cell_lines"]
+        cell_line_threshold = self.config["cell_line_confidence_threshold"]
+        rejection_reasons = self.stats["rejection_reasons"]
         
         for record in records:
             # Assess critical criteria
             db_assessment = self._assess_database_id(record)
             species_assessment = self._assess_species(record)
             cell_line_assessment = self._assess_cell_line(record)
+            record.pop(self.TEXT_CACHE_KEY, None)
             
             # Critical filter logic
             passes_critical = True
             rejection_reason = None
             
             # Must have valid database ID
-            if self.config["require_database_id"] and db_assessment['score'] == 0:
+            if require_database_id and db_assessment['score'] == 0:
                 passes_critical = False
                 rejection_reason = f"Missing database ID: {db_assessment['reason']}"
             
             # Must not be non-human (high confidence)
             elif (species_assessment['score'] == 0 and 
-                  species_assessment['confidence'] >= self.config["species_confidence_threshold"]):
+                  species_assessment['confidence'] >= species_threshold):
                 passes_critical = False
                 rejection_reason = f"Non-human species: {species_assessment['reason']}"
             
             # Must not be cell line (high confidence)
-            elif (self.config["exclude_cell_lines"] and 
+            elif (exclude_cell_lines and 
                   cell_line_assessment['score'] == 0 and 
-                  cell_line_assessment['confidence'] >= self.config["cell_line_confidence_threshold"]):
+                  cell_line_assessment['confidence'] >= cell_line_threshold):
                 passes_critical = False
                 rejection_reason = f"Cell line detected: {cell_line_assessment['reason']}"
             
@@ -177,54 +204,43 @@ class ScAgentDataCleaningFramework:
                     'cell_line': cell_line_assessment,
                     'passes_critical': True
                 }
-                passed_records.append(record)
+                yield record
             else:
                 # Track rejection reason
-                if rejection_reason not in self.stats["rejection_reasons"]:
-                    self.stats["rejection_reasons"][rejection_reason] = 0
-                self.stats["rejection_reasons"][rejection_reason] += 1
-        
-        return passed_records
+                rejection_reasons[rejection_reason] += 1
     
-    def _apply_confidence_filters(self, records: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+    def _apply_confidence_filters(self, records: Iterable[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
         """Apply confidence-based filtering to separate high-confidence from uncertain cases."""
         high_confidence = []
         uncertain = []
         
+        high_threshold = self.config["conservative_score_threshold"]
+        min_threshold = self.config["min_overall_score"]
+        
         for record in records:
             # Assess all criteria
             assessments = self._assess_all_criteria(record)
             overall_score = sum(assessment['score'] for assessment in assessments.values())
             
-            # Add comprehensive assessment to record
-            record['sc_eqtl_filter_result'].update({
-                'filter_details': assessments,
-                'overall_score': overall_score
-            })
-            
-            # Determine confidence level
-            if overall_score >= self.config["conservative_score_threshold"]:
+            # Add comprehensive assessment and confidence level to record in one update
+            if overall_score >= high_threshold:
                 # High confidence acceptance
                 record['sc_eqtl_filter_result'].update({
+                    'filter_details': assessments,
+                    'overall_score': overall_score,
                     'phase': 'high_confidence',
                     'decision': 'accept_high_confidence',
                     'confidence_level': 'high'
                 })
                 high_confidence.append(record)
-            
-            elif overall_score >= self.config["min_overall_score"]:
-                # Uncertain - needs further review
-                record['sc_eqtl_filter_result'].update({
-                    'phase': 'uncertain',
-                    'confidence_level': 'medium'
-                })
-                uncertain.append(record)
-            
             else:
-                # Low score - likely reject but give AI a chance
+                # Uncertain - needs further review; a low score likely rejects
+                # but still gives AI a chance
                 record['sc_eqtl_filter_result'].update({
+                    'filter_details': assessments,
+                    'overall_score': overall_score,
                     'phase': 'uncertain',
-                    'confidence_level': 'low'
+                    'confidence_level': 'medium' if overall_score >= min_threshold else 'low'
                 })
                 uncertain.append(record)
         
@@ -233,13 +249,14 @@ class ScAgentDataCleaningFramework:
     def _apply_conservative_filtering(self, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Apply conservative filtering when AI is not available."""
         accepted_records = []
+        acceptance_threshold = self.config["conservative_acceptance_threshold"]
         
         for record in records:
             filter_result = record['sc_eqtl_filter_result']
             overall_score = filter_result['overall_score']
             
             # Conservative acceptance criteria
-            if overall_score >= self.config["conservative_acceptance_threshold"]:
+            if overall_score >= acceptance_threshold:
                 filter_result.update({
                     'phase': 'conservative_accepted',
                     'decision': 'accept_conservative',
@@ -250,12 +267,10 @@ class ScAgentDataCleaningFramework:
                 filter_result.update({
                     'phase': 'conservative_rejected',
                     'decision': 'reject_conservative',
-                    'reason': f'Score {overall_score} below conservative threshold ({self.config["conservative_acceptance_threshold"]})'
+                    'reason': f'Score {overall_score} below conservative threshold ({acceptance_threshold})'
                 })
                 # Track rejection
-                reason = f"Conservative filter: score {overall_score} < {self.config['conservative_acceptance_threshold']}"
-                if reason not in self.stats["rejection_reasons"]:
-                    self.stats["rejection_reasons"][reason] = 0
+                reason = f"Conservative filter: score {overall_score} < {acceptance_threshold}"
                 self.stats["rejection_reasons"][reason] += 1
         
         return accepted_records
@@ -266,6 +281,30 @@ class ScAgentDataCleaningFramework:
         logger.warning("AI filtering not yet implemented, using conservative fallback")
         return self._apply_conservative_filtering(records)
     
+    def _extract_text(self, record: Dict[str, Any]) -> Dict[str, str]:
+        """
+        Lowercased title/summary text of a record, computed once per record.
+        
+        The result is cached on the record under TEXT_CACHE_KEY so the species
+        and cell line assessors share it; callers drop the key when done.
+        """
+        cached = record.get(self.TEXT_CACHE_KEY)
+        if cached is not None:
+            return cached
+        
+        title = (
+            record.get('gse_title') or record.get('geo_title') or 
+            record.get('study_title') or record.get('sra_study_title') or ''
+        ).lower()
+        summary = (
+            record.get('summary') or record.get('geo_summary') or 
+            record.get('study_abstract') or ''
+        ).lower()
+        
+        cached = {'title': title, 'summary': summary, 'text': f"{title} {summary}"}
+        record[self.TEXT_CACHE_KEY] = cached
+        return cached
+    
     def _assess_database_id(self, record: Dict[str, Any]) -> Dict[str, Any]:
         """Assess database ID availability."""
         # Check for GEO IDs
@@ -307,57 +346,35 @@ class ScAgentDataCleaningFramework:
                 return {"score": 2, "confidence": 0.9, "reason": "Human in organism field", "evidence": field}
         
         # Check text content
-        title = (
-            record.get('gse_title') or record.get('geo_title') or 
-            record.get('study_title') or record.get('sra_study_title') or ''
-        ).lower()
-        summary = (
-            record.get('summary') or record.get('geo_summary') or 
-            record.get('study_abstract') or ''
-        ).lower()
-        
-        text_content = f"{title} {summary}"
+        text_content = self._extract_text(record)['text']
         
         if 'homo sapiens' in text_content:
             return {"score": 2, "confidence": 0.8, "reason": "Homo sapiens in text", "evidence": "Found in title/summary"}
         
         # Human indicators
-        human_indicators = ['human', 'patient', 'clinical']
-        for indicator in human_indicators:
-            if indicator in text_content:
-                return {"score": 2, "confidence": 0.6, "reason": f"Human indicator: {indicator}", "evidence": indicator}
+        indicator = _first_keyword(self.HUMAN_INDICATORS, text_content)
+        if indicator:
+            return {"score": 2, "confidence": 0.6, "reason": f"Human indicator: {indicator}", "evidence": indicator}
         
         # Check for non-human indicators
-        non_human = ['mouse', 'rat', 'drosophila', 'zebrafish']
-        for indicator in non_human:
-            if indicator in text_content:
-                return {"score": 0, "confidence": 0.9, "reason": f"Non-human: {indicator}", "evidence": indicator}
+        indicator = _first_keyword(self.NON_HUMAN_INDICATORS, text_content)
+        if indicator:
+            return {"score": 0, "confidence": 0.9, "reason": f"Non-human: {indicator}", "evidence": indicator}
         
         return {"score": 0, "confidence": 0.5, "reason": "No human indicators", "evidence": "No clear species information"}
     
     def _assess_cell_line(self, record: Dict[str, Any]) -> Dict[str, Any]:
         """Assess cell line status."""
         # Get text content
-        title = (
-            record.get('gse_title') or record.get('geo_title') or 
-            record.get('study_title') or record.get('sra_study_title') or ''
-        ).lower()
-        summary = (
-            record.get('summary') or record.get('geo_summary') or 
-            record.get('study_abstract') or ''
-        ).lower()
-        
-        text_content = f"{title} {summary}"
+        text_content = self._extract_text(record)['text']
         
         # Cell line indicators
-        cell_line_keywords = ['hela', 'hek293', '293t', 'jurkat', 'k562', 'cell line']
-        for keyword in cell_line_keywords:
-            if keyword in text_content:
-                return {"score": 0, "confidence": 0.9, "reason": f"Cell line detected: {keyword}", "evidence": keyword}
+        keyword = _first_keyword(self.CELL_LINE_KEYWORDS, text_content)
+        if keyword:
+            return {"score": 0, "confidence": 0.9, "reason": f"Cell line detected: {keyword}", "evidence": keyword}
         
         # Primary tissue indicators
-        primary_indicators = ['primary', 'tissue', 'biopsy', 'patient', 'clinical']
-        primary_count = sum(1 for indicator in primary_indicators if indicator in text_content)
+        primary_count = sum(1 for indicator in self.PRIMARY_INDICATORS if indicator in text_content)
         
         if primary_count >= 2:
             return {"score": 2, "confidence": 0.8, "reason": "Strong primary tissue indicators", "evidence": f"Primary indicators: {primary_count}"}
@@ -371,10 +388,15 @@ class ScAgentDataCleaningFramework:
         assessments = {}
         
         # Core assessments (already done in critical phase)
+        # Only re-assess what the critical phase did not store
         filter_result = record.get('sc_eqtl_filter_result', {})
-        assessments['database_id'] = filter_result.get('database_id', self._assess_database_id(record))
-        assessments['species'] = filter_result.get('species', self._assess_species(record))
-        assessments['cell_line'] = filter_result.get('cell_line', self._assess_cell_line(record))
+        for name, assess in (
+            ('database_id', self._assess_database_id),
+            ('species', self._assess_species),
+            ('cell_line', self._assess_cell_line),
+        ):
+            assessments[name] = filter_result[name] if name in filter_result else assess(record)
+        record.pop(self.TEXT_CACHE_KEY, None)
         
         # Additional assessments (simplified for now)
         assessments['publication'] = {"score": 1, "confidence": 0.5, "reason": "Publication assessment placeholder"}
@@ -3,20 +3,17 @@
 Add more sample data to simulate real-world scale.
 """
 
+import argparse
+import csv
+import io
 import sys
-import os
-from pathlib import Path
-import random
-from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
 
-# Add the scAgent package to the path
-sys.path.insert(0, str(Path(__file__).parent.parent))
+import numpy as np
 
-from scAgent.db import get_connection
+from scAgent.db import get_connection, get_connection_pool, pooled_connection
 import logging
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 def generate_geo_data(num_records=100):
@@ -34,43 +31,53 @@ def generate_geo_data(num_records=100):
         "single cell sequencing", "droplet-based", "10x Genomics", "Smart-seq"
     ]
     
+    rng = np.random.default_rng()
+    
+    # Draw every random column in one call each instead of once per record
+    organism_col = rng.choice(organisms, size=num_records).tolist()
+    platform_col = rng.choice(platforms, size=num_records).tolist()
+    tissue_col = rng.choice(tissues, size=num_records).tolist()
+    cell_type_col = rng.choice(cell_types, size=num_records).tolist()
+    sc_keyword_col = rng.choice(sc_keywords, size=num_records).tolist()
+    
+    # Submission dates over 4 years from 2020-01-01, updated 1-30 days later
+    base_date = np.datetime64('2020-01-01')
+    submission_days = rng.integers(0, 1461, size=num_records)
+    update_days = submission_days + rng.integers(1, 31, size=num_records)
+    submission_dates = (base_date + submission_days).astype(str).tolist()
+    update_dates = (base_date + update_days).astype(str).tolist()
+    
+    sample_counts = rng.integers(10, 201, size=num_records).tolist()
+    
+    # 30% non-single-cell studies as controls
+    is_bulk = (rng.random(num_records) < 0.3).tolist()
+    
     data = []
-    base_date = datetime(2020, 1, 1)
     
     for i in range(num_records):
-        geo_id = f"GSE{100000 + i}"
-        organism = random.choice(organisms)
-        platform = random.choice(platforms)
-        tissue = random.choice(tissues)
-        cell_type = random.choice(cell_types)
-        sc_keyword = random.choice(sc_keywords)
-        
-        # Generate submission date
-        days_offset = random.randint(0, 1460)  # 4 years
-        submission_date = base_date + timedelta(days=days_offset)
-        update_date = submission_date + timedelta(days=random.randint(1, 30))
-        
-        # Generate sample count
-        sample_count = random.randint(10, 200)
+        organism = organism_col[i]
+        platform = platform_col[i]
+        tissue = tissue_col[i]
+        cell_type = cell_type_col[i]
+        sc_keyword = sc_keyword_col[i]
+        sample_count = sample_counts[i]
         
         # Create realistic titles and summaries
-        title = f"{sc_keyword} analysis of {organism} {tissue} {cell_type}s"
-        summary = f"This study presents {sc_keyword} data from {organism} {tissue} samples to investigate {cell_type} heterogeneity and gene expression patterns. We analyzed {sample_count} samples using {platform}."
-        
-        # Add some non-single-cell studies as controls
-        if random.random() < 0.3:  # 30% non-single-cell
+        if is_bulk[i]:
             title = f"Bulk RNA-seq analysis of {organism} {tissue}"
             summary = f"Bulk RNA sequencing analysis of {organism} {tissue} samples."
-            sc_keyword = "bulk RNA-seq"
+        else:
+            title = f"{sc_keyword} analysis of {organism} {tissue} {cell_type}s"
+            summary = f"This study presents {sc_keyword} data from {organism} {tissue} samples to investigate {cell_type} heterogeneity and gene expression patterns. We analyzed {sample_count} samples using {platform}."
         
         data.append((
-            geo_id,
+            f"GSE{100000 + i}",
             title,
             summary,
             organism,
             'Public',
-            submission_date.strftime('%Y-%m-%d'),
-            update_date.strftime('%Y-%m-%d'),
+            submission_dates[i],
+            update_dates[i],
             platform,
             'Expression profiling by high throughput sequencing',
             sample_count,
@@ -92,91 +99,194 @@ def generate_sra_data(num_records=100):
     tissues = ["brain", "heart", "liver", "kidney", "lung", "pancreas", "muscle", "skin", "blood", "bone marrow"]
     cell_types = ["neuron", "cardiomyocyte", "hepatocyte", "T cell", "B cell", "macrophage", "fibroblast", "endothelial cell"]
     
+    rng = np.random.default_rng()
+    
+    # Draw every random column in one call each instead of once per record
+    organism_col = rng.choice(organisms, size=num_records).tolist()
+    instrument_col = rng.choice(instruments, size=num_records).tolist()
+    tissue_col = rng.choice(tissues, size=num_records).tolist()
+    cell_type_col = rng.choice(cell_types, size=num_records).tolist()
+    platform_col = rng.choice(platforms, size=num_records).tolist()
+    strategy_col = rng.choice(library_strategies, size=num_records).tolist()
+    source_col = rng.choice(library_sources, size=num_records).tolist()
+    selection_col = rng.choice(library_selections, size=num_records).tolist()
+    
+    # Generate realistic sequencing stats
+    spots = rng.integers(1000000, 50000001, size=num_records)
+    bases = spots * rng.integers(50, 151, size=num_records)
+    bytes_sizes = bases * rng.integers(1, 4, size=num_records)
+    spots, bases, bytes_sizes = spots.tolist(), bases.tolist(), bytes_sizes.tolist()
+    
+    is_single_cell = (rng.random(num_records) > 0.3).tolist()  # 70% single-cell
+    
     data = []
     
     for i in range(num_records):
-        run_id = f"SRR{10000000 + i}"
-        sample_id = f"SRS{1000000 + i}"
-        experiment_id = f"SRX{1000000 + i}"
-        study_id = f"SRP{100000 + i}"
-        
-        organism = random.choice(organisms)
-        instrument = random.choice(instruments)
-        tissue = random.choice(tissues)
-        cell_type = random.choice(cell_types)
-        
-        # Generate realistic sequencing stats
-        spots = random.randint(1000000, 50000000)
-        bases = spots * random.randint(50, 150)
-        bytes_size = bases * random.randint(1, 3)
+        organism = organism_col[i]
+        tissue = tissue_col[i]
         
         # Create study titles and abstracts
-        is_single_cell = random.random() > 0.3  # 70% single-cell
-        if is_single_cell:
+        if is_single_cell[i]:
             study_title = f"Single-cell RNA-seq of {organism} {tissue}"
-            study_abstract = f"Single-cell RNA sequencing analysis of {organism} {tissue} samples to study {cell_type} heterogeneity."
+            study_abstract = f"Single-cell RNA sequencing analysis of {organism} {tissue} samples to study {cell_type_col[i]} heterogeneity."
         else:
             study_title = f"Bulk RNA-seq of {organism} {tissue}"
             study_abstract = f"Bulk RNA sequencing analysis of {organism} {tissue} samples."
         
         data.append((
-            run_id,
-            sample_id,
-            experiment_id,
-            study_id,
+            f"SRR{10000000 + i}",
+            f"SRS{1000000 + i}",
+            f"SRX{1000000 + i}",
+            f"SRP{100000 + i}",
             study_title,
             study_abstract,
-            random.choice(platforms),
-            instrument,
-            random.choice(library_strategies),
-            random.choice(library_sources),
-            random.choice(library_selections),
+            platform_col[i],
+            instrument_col[i],
+            strategy_col[i],
+            source_col[i],
+            selection_col[i],
             'SINGLE',
-            spots,
-            bases,
-            bytes_size,
+            spots[i],
+            bases[i],
+            bytes_sizes[i],
             organism,
             tissue,
-            cell_type
+            cell_type_col[i]
         ))
     
     return data
 
-def insert_batch_geo_data(conn, data):
-    """Insert batch GEO data."""
+GEO_COLUMNS = (
+    "geo_accession", "title", "summary", "organism", "status", "submission_date",
+    "last_update_date", "platform", "series_type", "sample_count", "contributor", "contact_email"
+)
+
+SRA_COLUMNS = (
+    "run_accession", "sample_accession", "experiment_accession", "study_accession",
+    "study_title", "study_abstract", "platform", "instrument", "library_strategy",
+    "library_source", "library_selection", "library_layout", "spots", "bases", "bytes",
+    "organism", "tissue", "cell_type"
+)
+
+class CsvRowStream:
+    """
+    Read-only file-like object that CSV-encodes rows as COPY asks for them.
     
-    insert_sql = """
-    INSERT INTO geo_master (
-        geo_accession, title, summary, organism, status, submission_date, 
-        last_update_date, platform, series_type, sample_count, contributor, contact_email
-    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-    ON CONFLICT (geo_accession) DO NOTHING;
+    copy_expert() reads in small blocks, so only about one block of CSV text
+    exists at a time instead of the whole batch.
     """
     
-    with conn.cursor() as cur:
-        cur.executemany(insert_sql, data)
-        logger.info(f"Inserted {len(data)} records into geo_master")
+    def __init__(self, rows):
+        self._rows = iter(rows)
+        self._buffer = io.StringIO()
+        self._writer = csv.writer(self._buffer)
+    
+    def read(self, size=-1):
+        while size < 0 or self._buffer.tell() < size:
+            row = next(self._rows, None)
+            if row is None:
+                break
+            self._writer.writerow(row)
+        
+        data = self._buffer.getvalue()
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        if 0 <= size < len(data):
+            # Keep what did not fit for the next read
+            self._buffer.write(data[size:])
+            data = data[:size]
+        return data
 
-def insert_batch_sra_data(conn, data):
-    """Insert batch SRA data."""
+def copy_rows(conn, table, columns, rows, conflict_column):
+    """
+    Bulk-insert rows with COPY, skipping rows whose key already exists.
+    
+    COPY cannot skip conflicting rows itself, so rows are copied into a
+    temporary staging table and moved over with INSERT ... ON CONFLICT.
+    All of it runs as one transaction, with synchronous_commit off since
+    the data is generated and can simply be loaded again.
+    
+    Returns:
+        Number of rows actually inserted
+    """
+    staging = f"staging_{table}"
+    column_list = ", ".join(columns)
+    
+    # get_connection()/pooled_connection() hand out autocommit connections
+    autocommit = conn.autocommit
+    conn.autocommit = False
+    try:
+        with conn, conn.cursor() as cur:
+            cur.execute("SET LOCAL synchronous_commit = off")
+            cur.execute(f"""
+                CREATE TEMP TABLE {staging} ON COMMIT DROP AS
+                SELECT {column_list} FROM {table} WITH NO DATA
+            """)
+            cur.copy_expert(f"COPY {staging} ({column_list}) FROM STDIN WITH (FORMAT csv)", CsvRowStream(rows))
+            cur.execute(f"""
+                INSERT INTO {table} ({column_list})
+                SELECT {column_list} FROM {staging}
+                ON CONFLICT ({conflict_column}) DO NOTHING
+            """)
+            inserted = cur.rowcount
+    finally:
+        conn.autocommit = autocommit
+    
+    return inserted
+
+# Rows per COPY stream below which a batch is not worth splitting
+MIN_SHARD_ROWS = 50000
+
+def copy_rows_sharded(conn, table, columns, rows, conflict_column, max_workers=4):
+    """
+    copy_rows split across parallel COPY streams on pooled connections.
     
-    insert_sql = """
-    INSERT INTO sra_master (
-        run_accession, sample_accession, experiment_accession, study_accession,
-        study_title, study_abstract, platform, instrument, library_strategy,
-        library_source, library_selection, library_layout, spots, bases, bytes,
-        organism, tissue, cell_type
-    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-    ON CONFLICT (run_accession) DO NOTHING;
+    A single COPY is processed by one server backend, so large batches
+    are split into contiguous shards, each copied on its own connection.
+    Batches too small to split are copied on ``conn``.
+    
+    Returns:
+        Number of rows actually inserted
     """
+    shard_count = min(max_workers, len(rows) // MIN_SHARD_ROWS)
+    if shard_count <= 1:
+        return copy_rows(conn, table, columns, rows, conflict_column)
+    
+    # The shared pool raises rather than waits when exhausted, so stay within it
+    shard_count = min(shard_count, get_connection_pool().maxconn)
+    shard_size = -(-len(rows) // shard_count)
+    shards = [rows[i:i + shard_size] for i in range(0, len(rows), shard_size)]
     
-    with conn.cursor() as cur:
-        cur.executemany(insert_sql, data)
-        logger.info(f"Inserted {len(data)} records into sra_master")
+    def copy_shard(shard):
+        with pooled_connection() as shard_conn:
+            return copy_rows(shard_conn, table, columns, shard, conflict_column)
+    
+    logger.info(f"Copying {len(rows)} rows into {table} over {len(shards)} connections")
+    with ThreadPoolExecutor(max_workers=len(shards)) as executor:
+        return sum(executor.map(copy_shard, shards))
+
+def insert_batch_geo_data(conn, data, max_workers=4):
+    """Insert batch GEO data."""
+    
+    inserted = copy_rows_sharded(conn, "geo_master", GEO_COLUMNS, data, "geo_accession", max_workers)
+    logger.info(f"Inserted {inserted} of {len(data)} records into geo_master")
+
+def insert_batch_sra_data(conn, data, max_workers=4):
+    """Insert batch SRA data."""
+    
+    inserted = copy_rows_sharded(conn, "sra_master", SRA_COLUMNS, data, "run_accession", max_workers)
+    logger.info(f"Inserted {inserted} of {len(data)} records into sra_master")
 
 def main():
     """Main function to add more sample data."""
     
+    parser = argparse.ArgumentParser(description="Add generated GEO/SRA sample data")
+    parser.add_argument("--records", type=int, default=200,
+                        help="Records to generate per table (default: 200)")
+    parser.add_argument("--workers", type=int, default=4,
+                        help="Parallel COPY streams for large batches (default: 4)")
+    args = parser.parse_args()
+    
     print("🚀 Adding more sample data to scAgent database...")
     
     try:
@@ -186,43 +296,40 @@ def main():
         
         # Generate and insert GEO data
         print("📊 Generating GEO sample data...")
-        geo_data = generate_geo_data(200)  # Generate 200 records
-        insert_batch_geo_data(conn, geo_data)
+        geo_data = generate_geo_data(args.records)
+        insert_batch_geo_data(conn, geo_data, args.workers)
         
         # Generate and insert SRA data
         print("📊 Generating SRA sample data...")
-        sra_data = generate_sra_data(200)  # Generate 200 records
-        insert_batch_sra_data(conn, sra_data)
+        sra_data = generate_sra_data(args.records)
+        insert_batch_sra_data(conn, sra_data, args.workers)
         
-        # Commit changes
-        conn.commit()
+        # Nothing to commit here: each COPY load (and each parallel shard)
+        # commits its own transaction, so the GEO and SRA loads are not atomic
+        # together
         
         print("✅ Sample data addition complete!")
         
         # Show final counts
         with conn.cursor() as cur:
-            cur.execute("SELECT COUNT(*) FROM geo_master")
-            geo_count = cur.fetchone()[0]
-            
-            cur.execute("SELECT COUNT(*) FROM sra_master")
-            sra_count = cur.fetchone()[0]
-            
-            print(f"\nFinal counts:")
-            print(f"  - geo_master: {geo_count} records")
-            print(f"  - sra_master: {sra_count} records")
-            
-            # Show single-cell data counts
+            # One scan per table yields both the total and the single-cell count
             cur.execute("""
-                SELECT COUNT(*) FROM geo_master 
-                WHERE title ILIKE '%single%cell%' OR title ILIKE '%scRNA%'
+                SELECT COUNT(*),
+                       COUNT(*) FILTER (WHERE LOWER(title) LIKE '%single%cell%' OR LOWER(title) LIKE '%scrna%')
+                FROM geo_master
             """)
-            sc_geo_count = cur.fetchone()[0]
+            geo_count, sc_geo_count = cur.fetchone()
             
             cur.execute("""
-                SELECT COUNT(*) FROM sra_master 
-                WHERE study_title ILIKE '%single%cell%' OR study_title ILIKE '%scRNA%'
+                SELECT COUNT(*),
+                       COUNT(*) FILTER (WHERE LOWER(study_title) LIKE '%single%cell%' OR LOWER(study_title) LIKE '%scrna%')
+                FROM sra_master
             """)
-            sc_sra_count = cur.fetchone()[0]
+            sra_count, sc_sra_count = cur.fetchone()
+            
+            print(f"\nFinal counts:")
+            print(f"  - geo_master: {geo_count} records")
+            print(f"  - sra_master: {sra_count} records")
             
             print(f"\nSingle-cell data:")
             print(f"  - geo_master: {sc_geo_count} sc-RNA records")
@@ -237,4 +344,5 @@ def main():
     return 0
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
     sys.exit(main()) 
\ No newline at end of file
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Create trigram indexes for the text columns scanned by scAgent.
+
+The human/species probes filter with LOWER(column) LIKE '%...%', which can
+only use an index built on the same expression with gin_trgm_ops. taxon_id
+gets a plain B-tree for the human candidate pre-filter, and the ID columns
+for the newest-first samples.
+"""
+
+import sys
+
+from scAgent.db import get_connection
+import logging
+
+logger = logging.getLogger(__name__)
+
+# (index name, table, column)
+TEXT_INDEXES = (
+    ("idx_sra_scientific_name_lower_trgm", "srameta.sra_master", "scientific_name"),
+    ("idx_sra_study_title_lower_trgm", "srameta.sra_master", "study_title"),
+    ("idx_sra_design_description_lower_trgm", "srameta.sra_master", "design_description"),
+    ("idx_sra_common_name_lower_trgm", "srameta.sra_master", "common_name"),
+    ("idx_geo_organism_lower_trgm", "geometa.geo_master", "organism"),
+    ("idx_geo_gse_title_lower_trgm", "geometa.geo_master", "gse_title"),
+    ("idx_geo_organism_ch1_lower_trgm", "geometa.geo_master", "organism_ch1"),
+)
+
+# (index name, table, column) for plain B-tree lookups. The "sra_ID"/"gse_ID"
+# indexes serve the ORDER BY ... DESC LIMIT n samples as backward index scans
+# instead of a full sort.
+BTREE_INDEXES = (
+    ("idx_sra_taxon_id", "srameta.sra_master", "taxon_id"),
+    ("idx_sra_sra_id", "srameta.sra_master", "sra_ID"),
+    ("idx_geo_gse_id", "geometa.geo_master", "gse_ID"),
+)
+
+def create_text_indexes(conn):
+    """Create the pg_trgm extension and the LOWER(column) trigram indexes."""
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    conn.autocommit = True
+
+    with conn.cursor() as cur:
+        cur.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        logger.info("pg_trgm extension available")
+
+        for index_name, table, column in TEXT_INDEXES:
+            logger.info(f"Creating {index_name} on {table} (LOWER({column}))")
+            cur.execute(f"""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS {index_name}
+            ON {table} USING gin (LOWER({column}) gin_trgm_ops)
+            """)
+
+        for index_name, table, column in BTREE_INDEXES:
+            logger.info(f"Creating {index_name} on {table} ({column})")
+            cur.execute(f"""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS {index_name}
+            ON {table} ("{column}")
+            """)
+
+        # Refresh planner statistics so the new indexes are picked up
+        for table in sorted({table for _, table, _ in TEXT_INDEXES + BTREE_INDEXES}):
+            cur.execute(f"ANALYZE {table}")
+
+def main():
+    """Main function to create the text indexes."""
+
+    print("🚀 Creating text search indexes...")
+
+    try:
+        conn = get_connection()
+        print("✅ Connected to database")
+
+        create_text_indexes(conn)
+
+        print("✅ Index creation complete!")
+        print("\nIndexes:")
+        for index_name, table, column in TEXT_INDEXES:
+            print(f"  - {index_name}: {table} (LOWER({column}))")
+        for index_name, table, column in BTREE_INDEXES:
+            print(f"  - {index_name}: {table} ({column})")
+
+        conn.close()
+
+    except Exception as e:
+        logger.error(f"Index creation failed: {e}")
+        return 1
+
+    return 0
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    sys.exit(main())
@@ -5,76 +5,76 @@ Creates sample tables and inserts demo data.
 """
 
 import sys
-import os
-from pathlib import Path
 
-# Add the scAgent package to the path
-sys.path.insert(0, str(Path(__file__).parent.parent))
+from psycopg2.extras import execute_values
 
 from scAgent.db import get_connection
 import logging
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def create_geo_master_table(conn):
-    """Create geo_master table with sample structure."""
-    
-    create_sql = """
-    CREATE TABLE IF NOT EXISTS geo_master (
-        id SERIAL PRIMARY KEY,
-        geo_accession VARCHAR(50) UNIQUE NOT NULL,
-        title TEXT,
-        summary TEXT,
-        organism VARCHAR(100),
-        status VARCHAR(20),
-        submission_date DATE,
-        last_update_date DATE,
-        platform VARCHAR(100),
-        series_type VARCHAR(50),
-        sample_count INTEGER,
-        contributor TEXT,
-        contact_email VARCHAR(255),
-        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-    );
-    """
-    
-    with conn.cursor() as cur:
-        cur.execute(create_sql)
-        logger.info("Created geo_master table")
+GEO_MASTER_DDL = """
+CREATE TABLE IF NOT EXISTS geo_master (
+    id SERIAL PRIMARY KEY,
+    geo_accession VARCHAR(50) UNIQUE NOT NULL,
+    title TEXT,
+    summary TEXT,
+    organism VARCHAR(100),
+    status VARCHAR(20),
+    submission_date DATE,
+    last_update_date DATE,
+    platform VARCHAR(100),
+    series_type VARCHAR(50),
+    sample_count INTEGER,
+    contributor TEXT,
+    contact_email VARCHAR(255),
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+"""
 
-def create_sra_master_table(conn):
-    """Create sra_master table with sample structure."""
-    
-    create_sql = """
-    CREATE TABLE IF NOT EXISTS sra_master (
-        id SERIAL PRIMARY KEY,
-        run_accession VARCHAR(50) UNIQUE NOT NULL,
-        sample_accession VARCHAR(50),
-        experiment_accession VARCHAR(50),
-        study_accession VARCHAR(50),
-        study_title TEXT,
-        study_abstract TEXT,
-        platform VARCHAR(100),
-        instrument VARCHAR(100),
-        library_strategy VARCHAR(50),
-        library_source VARCHAR(50),
-        library_selection VARCHAR(50),
-        library_layout VARCHAR(20),
-        spots BIGINT,
-        bases BIGINT,
-        bytes BIGINT,
-        organism VARCHAR(100),
-        tissue VARCHAR(100),
-        cell_type VARCHAR(100),
-        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-    );
-    """
+SRA_MASTER_DDL = """
+CREATE TABLE IF NOT EXISTS sra_master (
+    id SERIAL PRIMARY KEY,
+    run_accession VARCHAR(50) UNIQUE NOT NULL,
+    sample_accession VARCHAR(50),
+    experiment_accession VARCHAR(50),
+    study_accession VARCHAR(50),
+    study_title TEXT,
+    study_abstract TEXT,
+    platform VARCHAR(100),
+    instrument VARCHAR(100),
+    library_strategy VARCHAR(50),
+    library_source VARCHAR(50),
+    library_selection VARCHAR(50),
+    library_layout VARCHAR(20),
+    spots BIGINT,
+    bases BIGINT,
+    bytes BIGINT,
+    organism VARCHAR(100),
+    tissue VARCHAR(100),
+    cell_type VARCHAR(100),
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+"""
+
+# The counts filter with LOWER(title) LIKE '%...%', which only a trigram
+# index on the same expression can serve
+TITLE_INDEX_DDL = """
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE INDEX IF NOT EXISTS idx_geo_master_title_lower_trgm
+    ON geo_master USING gin (LOWER(title) gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_sra_master_study_title_lower_trgm
+    ON sra_master USING gin (LOWER(study_title) gin_trgm_ops);
+"""
+
+def create_schema(conn):
+    """Create the geo_master/sra_master tables and their title indexes."""
     
+    # Sent as one multi-statement string: a single round trip, and Postgres
+    # runs it as one implicit transaction, so a failure leaves nothing behind
     with conn.cursor() as cur:
-        cur.execute(create_sql)
-        logger.info("Created sra_master table")
+        cur.execute(GEO_MASTER_DDL + SRA_MASTER_DDL + TITLE_INDEX_DDL)
+        logger.info("Created geo_master and sra_master tables with title trigram indexes")
 
 def insert_sample_geo_data(conn):
     """Insert sample data into geo_master table."""
@@ -128,12 +128,12 @@ def insert_sample_geo_data(conn):
     INSERT INTO geo_master (
         geo_accession, title, summary, organism, status, submission_date, 
         last_update_date, platform, series_type, sample_count, contributor, contact_email
-    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+    ) VALUES %s
     ON CONFLICT (geo_accession) DO NOTHING;
     """
     
     with conn.cursor() as cur:
-        cur.executemany(insert_sql, sample_data)
+        execute_values(cur, insert_sql, sample_data, page_size=1000)
         logger.info(f"Inserted {len(sample_data)} sample records into geo_master")
 
 def insert_sample_sra_data(conn):
@@ -208,12 +208,12 @@ def insert_sample_sra_data(conn):
         study_title, study_abstract, platform, instrument, library_strategy,
         library_source, library_selection, library_layout, spots, bases, bytes,
         organism, tissue, cell_type
-    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+    ) VALUES %s
     ON CONFLICT (run_accession) DO NOTHING;
     """
     
     with conn.cursor() as cur:
-        cur.executemany(insert_sql, sample_data)
+        execute_values(cur, insert_sql, sample_data, page_size=1000)
         logger.info(f"Inserted {len(sample_data)} sample records into sra_master")
 
 def main():
@@ -228,8 +228,7 @@ def main():
         
         # Create tables
         print("📊 Creating tables...")
-        create_geo_master_table(conn)
-        create_sra_master_table(conn)
+        create_schema(conn)
         
         # Insert sample data
         print("📥 Inserting sample data...")
@@ -246,11 +245,11 @@ def main():
         
         # Show table counts
         with conn.cursor() as cur:
-            cur.execute("SELECT COUNT(*) FROM geo_master")
-            geo_count = cur.fetchone()[0]
-            
-            cur.execute("SELECT COUNT(*) FROM sra_master")
-            sra_count = cur.fetchone()[0]
+            cur.execute("""
+                SELECT (SELECT COUNT(*) FROM geo_master),
+                       (SELECT COUNT(*) FROM sra_master)
+            """)
+            geo_count, sra_count = cur.fetchone()
             
             print(f"\nFinal counts:")
             print(f"  - geo_master: {geo_count} records")
@@ -265,4 +264,5 @@ def main():
     return 0
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
     sys.exit(main()) 
\ No newline at end of file
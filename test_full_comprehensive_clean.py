@@ -2,24 +2,83 @@
 """
 Test script for full comprehensive clean with proper field mapping
 """
-import sys
-import os
-sys.path.append(os.path.dirname(__file__))
+from concurrent.futures import ThreadPoolExecutor
 
-from scAgent.db.query import execute_query
+import pandas as pd
+
+from scAgent.db import pooled_connection
+from scAgent.db.query import execute_query_frame, SRA_HUMAN_CANDIDATE_SQL, GEO_HUMAN_CANDIDATE_SQL
 from scAgent.utils import apply_intelligent_sc_eqtl_filters
 from rich.console import Console
 
 console = Console()
 
+# (integrated field, source column) pairs; several integrated names alias the
+# same source column for compatibility with the different assessors
+SRA_INTEGRATED_FIELDS = (
+    # Use SRA data as primary
+    ("sra_run_accession", "run_accession"),
+    ("run_accession", "run_accession"),
+    ("sra_study_accession", "study_accession"),
+    ("study_accession", "study_accession"),
+    # Species information (multiple field names for compatibility)
+    ("scientific_name", "scientific_name"),
+    ("organism", "scientific_name"),
+    ("sra_organism", "scientific_name"),
+    ("common_name", "common_name"),
+    ("taxon_id", "taxon_id"),
+    # Title/summary information
+    ("sra_study_title", "study_title"),
+    ("study_title", "study_title"),
+    ("geo_title", "study_title"),
+    ("study_abstract", "study_abstract"),
+    ("geo_summary", "study_abstract"),
+    ("summary", "study_abstract"),
+    # Technical details
+    ("platform", "platform"),
+    ("instrument_model", "instrument_model"),
+    ("library_strategy", "library_strategy"),
+    ("library_layout", "library_layout"),
+    ("spots", "spots"),
+    ("bases", "bases"),
+    # Additional fields
+    ("design_description", "design_description"),
+    ("sample_name", "sample_name"),
+    ("description", "description"),
+)
+
+GEO_INTEGRATED_FIELDS = (
+    # GEO information
+    ("geo_accession", "gse"),
+    ("gse", "gse"),
+    # Species information
+    ("organism", "organism"),
+    ("geo_organism", "organism"),
+    # Title/summary
+    ("geo_title", "gse_title"),
+    ("gse_title", "gse_title"),
+    ("geo_summary", "summary"),
+    ("summary", "summary"),
+    # Platform
+    ("geo_platform", "platform"),
+    ("platform", "platform"),
+)
+
+def integrate_frame(frame, fields, **metadata):
+    """Build integrated records by copying (aliasing) whole columns at once."""
+    integrated = pd.DataFrame(
+        {field: frame[column] for field, column in fields}, index=frame.index
+    ).assign(**metadata)
+    return integrated.to_dict("records")
+
 def test_full_comprehensive_clean():
     """Test the full comprehensive clean process with proper handling."""
     
     print("=== Testing Full Comprehensive Clean Process ===")
     
-    # Step 1: Load SRA data with proper field names
-    print("\n1. Loading SRA data...")
-    sra_query = """
+    # Step 1: SRA query with proper field names. Only human candidates are
+    # fetched; the intelligent filter still scores every loaded record.
+    sra_query = f"""
     SELECT 
         run_accession,
         study_title,
@@ -49,16 +108,13 @@ def test_full_comprehensive_clean():
         'SRA' as data_source
     FROM srameta.sra_master
     WHERE "run_accession" IS NOT NULL AND "run_accession" != ''
+      AND {SRA_HUMAN_CANDIDATE_SQL}
     ORDER BY "sra_ID" DESC
     LIMIT 20
     """
     
-    sra_records = execute_query(sra_query)
-    print(f"✓ Loaded {len(sra_records)} SRA records")
-    
-    # Step 2: Load GEO data  
-    print("\n2. Loading GEO data...")
-    geo_query = """
+    # Step 2: GEO query
+    geo_query = f"""
     SELECT 
         gse,
         gse_title,
@@ -68,89 +124,35 @@ def test_full_comprehensive_clean():
         gse_submission_date as submission_date,
         'GEO' as data_source
     FROM geometa.geo_master
+    WHERE {GEO_HUMAN_CANDIDATE_SQL}
     ORDER BY "gse_ID" DESC
     LIMIT 5
     """
     
-    geo_records = execute_query(geo_query)
+    # The two loads are independent, so run them at the same time on two
+    # pooled connections
+    print("\n1-2. Loading SRA and GEO data...")
+    with pooled_connection() as sra_conn, pooled_connection() as geo_conn, \
+            ThreadPoolExecutor(max_workers=2) as executor:
+        sra_future = executor.submit(execute_query_frame, sra_query, None, sra_conn)
+        geo_future = executor.submit(execute_query_frame, geo_query, None, geo_conn)
+        sra_records = sra_future.result()
+        geo_records = geo_future.result()
+    print(f"✓ Loaded {len(sra_records)} SRA records")
     print(f"✓ Loaded {len(geo_records)} GEO records")
     
     # Step 3: Create simple integrated records (focusing on SRA data)
     print("\n3. Creating integrated records...")
     
-    integrated_records = []
-    
-    # Add SRA-only records (these should work well)
-    for sra_record in sra_records:
-        integrated_record = {
-            # Use SRA data as primary
-            "sra_run_accession": sra_record.get('run_accession', ''),
-            "run_accession": sra_record.get('run_accession', ''),  # For compatibility
-            "sra_study_accession": sra_record.get('study_accession', ''),
-            "study_accession": sra_record.get('study_accession', ''),  # For compatibility
-            
-            # Species information (multiple field names for compatibility)
-            "scientific_name": sra_record.get('scientific_name', ''),
-            "organism": sra_record.get('scientific_name', ''),  # Map scientific_name to organism
-            "sra_organism": sra_record.get('scientific_name', ''),
-            "common_name": sra_record.get('common_name', ''),
-            "taxon_id": sra_record.get('taxon_id', ''),
-            
-            # Title/summary information
-            "sra_study_title": sra_record.get('study_title', ''),
-            "study_title": sra_record.get('study_title', ''),  # For compatibility
-            "geo_title": sra_record.get('study_title', ''),  # For compatibility
-            "study_abstract": sra_record.get('study_abstract', ''),
-            "geo_summary": sra_record.get('study_abstract', ''),  # For compatibility
-            "summary": sra_record.get('study_abstract', ''),  # For compatibility
-            
-            # Technical details
-            "platform": sra_record.get('platform', ''),
-            "instrument_model": sra_record.get('instrument_model', ''),
-            "library_strategy": sra_record.get('library_strategy', ''),
-            "library_layout": sra_record.get('library_layout', ''),
-            "spots": sra_record.get('spots', 0),
-            "bases": sra_record.get('bases', 0),
-            
-            # Additional fields
-            "design_description": sra_record.get('design_description', ''),
-            "sample_name": sra_record.get('sample_name', ''),
-            "description": sra_record.get('description', ''),
-            
-            # Metadata
-            "relationship_type": "sra_only",
-            "data_source": "SRA",
-            "mapping_confidence": 1.0
-        }
-        integrated_records.append(integrated_record)
-    
-    # Add a few GEO-only records for completeness
-    for geo_record in geo_records[:3]:
-        integrated_record = {
-            # GEO information
-            "geo_accession": geo_record.get('gse', ''),
-            "gse": geo_record.get('gse', ''),  # For compatibility
-            
-            # Species information
-            "organism": geo_record.get('organism', ''),
-            "geo_organism": geo_record.get('organism', ''),
-            
-            # Title/summary
-            "geo_title": geo_record.get('gse_title', ''),
-            "gse_title": geo_record.get('gse_title', ''),  # For compatibility
-            "geo_summary": geo_record.get('summary', ''),
-            "summary": geo_record.get('summary', ''),  # For compatibility
-            
-            # Platform
-            "geo_platform": geo_record.get('platform', ''),
-            "platform": geo_record.get('platform', ''),  # For compatibility
-            
-            # Metadata
-            "relationship_type": "geo_only",
-            "data_source": "GEO",
-            "mapping_confidence": 0.5
-        }
-        integrated_records.append(integrated_record)
+    # Add SRA-only records (these should work well), then a few GEO-only
+    # records for completeness
+    integrated_records = integrate_frame(
+        sra_records, SRA_INTEGRATED_FIELDS,
+        relationship_type="sra_only", data_source="SRA", mapping_confidence=1.0
+    ) + integrate_frame(
+        geo_records.head(3), GEO_INTEGRATED_FIELDS,
+        relationship_type="geo_only", data_source="GEO", mapping_confidence=0.5
+    )
     
     print(f"✓ Created {len(integrated_records)} integrated records")
     
@@ -3,9 +3,17 @@
 Test script for scAgent functionality.
 """
 
+import argparse
+import hashlib
+import io
 import sys
 import os
 import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+from itertools import islice
 from pathlib import Path
 
 # Add the scAgent package to the path
@@ -13,7 +21,7 @@ sys.path.insert(0, str(Path(__file__).parent))
 
 from scAgent.db import test_connection, get_table_info
 from scAgent.models import get_qwen_client
-from scAgent.db.query import query_geo_master, query_sra_master
+from scAgent.db.query import query_geo_master, query_sra_master, QUERY_CACHE_DIR
 
 # Configure logging
 logging.basicConfig(
@@ -22,6 +30,48 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# test_ai_analysis reuses a response for the same model and prompt this long
+AI_RESPONSE_CACHE_DIR = QUERY_CACHE_DIR / "ai"
+AI_RESPONSE_CACHE_TTL = 24 * 60 * 60
+
+_client_lock = threading.Lock()
+
+@lru_cache(maxsize=1)
+def _cached_client():
+    return get_qwen_client()
+
+def _client():
+    """Qwen client shared by the model tests, so they reuse one HTTP session."""
+    # The tests run concurrently; the lock keeps them from building two clients
+    with _client_lock:
+        return _cached_client()
+
+class _PerThreadStdout:
+    """Stdout stand-in that gives every test thread its own output buffer."""
+    
+    def __init__(self, stream):
+        self.stream = stream
+        self._local = threading.local()
+    
+    def write(self, text):
+        return getattr(self._local, "buffer", self.stream).write(text)
+    
+    def flush(self):
+        self.stream.flush()
+    
+    def run(self, test_name, test_func):
+        """Run one test in the calling thread, returning (result, captured output)."""
+        self._local.buffer = io.StringIO()
+        try:
+            try:
+                result = test_func()
+            except Exception as e:
+                print(f"❌ {test_name} test crashed: {e}")
+                result = False
+            return result, self._local.buffer.getvalue()
+        finally:
+            del self._local.buffer
+
 def test_database_connection():
     """Test database connection."""
     print("=" * 50)
@@ -61,7 +111,7 @@ def test_model_connection():
     print("=" * 50)
     
     try:
-        client = get_qwen_client()
+        client = _client()
         result = client.test_connection()
         
         if result["status"] == "success":
@@ -87,8 +137,9 @@ def test_table_analysis():
     print("=" * 50)
     
     try:
-        # Test with both tables
-        table_info = get_table_info(["geo_master", "sra_master"])
+        # Test with both tables; the schema rarely changes between runs, so
+        # reuse an analysis up to 5 minutes old
+        table_info = get_table_info(["geo_master", "sra_master"], cache_ttl=300)
         
         for table_name, info in table_info.items():
             print(f"\n📊 Table: {table_name}")
@@ -121,24 +172,29 @@ def test_data_queries():
     print("=" * 50)
     
     try:
+        # The two queries are independent, so run them at the same time
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            geo_future = executor.submit(query_geo_master, limit=5)
+            sra_future = executor.submit(query_sra_master, limit=5)
+            geo_results = geo_future.result()
+            sra_results = sra_future.result()
+        
         # Test geo_master query
         print("Testing geo_master query...")
-        geo_results = query_geo_master(limit=5)
         print(f"✅ geo_master query successful! Retrieved {len(geo_results)} records")
         
         if geo_results:
             print("   Sample record columns:")
-            for key in list(geo_results[0].keys())[:5]:
+            for key in islice(geo_results[0], 5):
                 print(f"     - {key}")
         
         # Test sra_master query
         print("\nTesting sra_master query...")
-        sra_results = query_sra_master(limit=5)
         print(f"✅ sra_master query successful! Retrieved {len(sra_results)} records")
         
         if sra_results:
             print("   Sample record columns:")
-            for key in list(sra_results[0].keys())[:5]:
+            for key in islice(sra_results[0], 5):
                 print(f"     - {key}")
         
         return True
@@ -147,14 +203,14 @@ def test_data_queries():
         print(f"❌ Data query test failed: {e}")
         return False
 
-def test_ai_analysis():
-    """Test AI analysis functionality."""
+def test_ai_analysis(cache_ttl=AI_RESPONSE_CACHE_TTL):
+    """Test AI analysis functionality (cache_ttl=None always queries the model)."""
     print("\n" + "=" * 50)
     print("Testing AI Analysis")
     print("=" * 50)
     
     try:
-        client = get_qwen_client()
+        client = _client()
         
         # Test simple analysis
         prompt = """Analyze this sample bioinformatics data for sc-eQTL suitability:
@@ -163,14 +219,35 @@ Sample data: A dataset contains single-cell RNA-seq data from human brain tissue
 
 Please provide a brief assessment of its suitability for sc-eQTL analysis."""
         
-        print("Sending analysis request to AI model...")
-        response = client.generate(prompt, temperature=0.3, max_tokens=500)
+        cache_key = hashlib.sha1((client.model_name + prompt).encode("utf-8")).hexdigest()
+        cache_path = AI_RESPONSE_CACHE_DIR / f"{cache_key}.txt"
+        content = None
+        if cache_ttl is not None:
+            try:
+                if time.time() - cache_path.stat().st_mtime <= cache_ttl:
+                    content = cache_path.read_text(encoding="utf-8")
+                    print("Using cached AI response (run with --no-ai-cache to query the model)...")
+            except OSError:
+                pass
+        
+        if content is None:
+            print("Sending analysis request to AI model...")
+            response = client.generate(prompt, temperature=0.3, max_tokens=500)
+            content = response.content
+            
+            # Only keep real answers; failed requests come back as error content
+            if cache_ttl is not None and content and "error" not in (response.raw_response or {}):
+                try:
+                    AI_RESPONSE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+                    cache_path.write_text(content, encoding="utf-8")
+                except OSError as e:
+                    logger.warning(f"Could not cache AI response: {e}")
         
         print("✅ AI analysis successful!")
-        print(f"Response length: {len(response.content)} characters")
+        print(f"Response length: {len(content)} characters")
         print("\nAI Response:")
         print("-" * 40)
-        print(response.content[:300] + "..." if len(response.content) > 300 else response.content)
+        print(content[:300] + "..." if len(content) > 300 else content)
         
         return True
         
@@ -180,6 +257,11 @@ Please provide a brief assessment of its suitability for sc-eQTL analysis."""
 
 def main():
     """Run all tests."""
+    parser = argparse.ArgumentParser(description="Run the scAgent system tests")
+    parser.add_argument("--no-ai-cache", action="store_true",
+                        help="Always query the model instead of reusing a cached AI analysis response")
+    args = parser.parse_args()
+    
     print("🧪 Starting scAgent System Tests")
     print("=" * 60)
     
@@ -188,18 +270,26 @@ def main():
         ("Model API Connection", test_model_connection),
         ("Table Analysis", test_table_analysis),
         ("Data Queries", test_data_queries),
-        ("AI Analysis", test_ai_analysis),
+        ("AI Analysis", partial(test_ai_analysis, cache_ttl=None) if args.no_ai_cache else test_ai_analysis),
     ]
     
     results = []
     
-    for test_name, test_func in tests:
-        try:
-            result = test_func()
-            results.append((test_name, result))
-        except Exception as e:
-            print(f"❌ {test_name} test crashed: {e}")
-            results.append((test_name, False))
+    # The tests are independent and mostly wait on Postgres or the model API,
+    # so run them all at once; each one's output is buffered and printed in
+    # the usual order afterwards
+    stdout = _PerThreadStdout(sys.stdout)
+    sys.stdout = stdout
+    try:
+        with ThreadPoolExecutor(max_workers=len(tests)) as executor:
+            futures = [executor.submit(stdout.run, test_name, test_func) for test_name, test_func in tests]
+            outcomes = [future.result() for future in futures]
+    finally:
+        sys.stdout = stdout.stream
+    
+    for (test_name, _), (result, output) in zip(tests, outcomes):
+        sys.stdout.write(output)
+        results.append((test_name, result))
     
     # Summary
     print("\n" + "=" * 60)